@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Rebuild full packages from a previous release and a delta package.
+
+    python3 scripts/gen-premiere-package.py --cuts v2 --archive out/v2-delta.tar.gz \
+        --delta-from releases/ai-selves-leti-v2.tar.gz
+    python3 scripts/apply-delta.py releases/ai-selves-leti-v2.tar.gz out/v2-delta.tar.gz -o out/v2-full.tar.gz
+
+Every file is checked against the delta's manifests, so applying a delta
+to the wrong base fails instead of producing a mixed package.
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+
+from premiere_kit.delta import DELTA, apply_delta, iter_archive
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", help="the release the delta was made against (archive or directory)")
+    parser.add_argument("delta", help="delta archive from gen-premiere-package.py --delta-from")
+    parser.add_argument("-o", "--output", required=True,
+                        help="directory, or .tar.gz/.tgz/.zip, for the rebuilt packages")
+    args = parser.parse_args()
+
+    # Closing the generator right away closes the archive it stopped in
+    with contextlib.closing(iter_archive(args.delta)) as members:
+        info = next((json.load(f) for name, f in members if name == DELTA), {})
+    try:
+        count = apply_delta(args.base, args.delta, args.output)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ {args.output}: {count} files ({len(info.get('files', []))} from the delta, "
+          f"{len(info.get('removed', []))} removed), all checksums verified")
+
+if __name__ == "__main__":
+    main()
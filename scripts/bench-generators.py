@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Benchmark the timeline emitters on synthetic cuts from 20 to 100k sections.
+
+Synthetic sections are drawn (seeded) from SECTIONS_V1 + SECTIONS_V2, so
+durations, subtitle counts and text lengths follow the real cuts. For every
+size it measures generation time, peak Python memory (tracemalloc) and
+output size of:
+
+  xml         premiere_kit.package generate_xml()
+  srt         premiere_kit.package generate_srt()
+  prproj-xml  generate-prproj-xml.py build_xml()
+  placeholders  generate_placeholders() with ffmpeg stubbed out
+                (hashing, cache, linking and scheduling only)
+
+Results can be saved as a baseline and later runs compared against it:
+
+    python3 scripts/bench-generators.py --save-baseline
+    python3 scripts/bench-generators.py --compare --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from premiere_kit import package
+from premiere_kit.cuts import SECTIONS_V1, SECTIONS_V2
+from premiere_kit.targets import DEFAULT as DEFAULT_TARGET
+from premiere_kit.timeline import Timeline
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = ".cache/bench-generators.json"
+NOISE_FLOOR_S = 0.005  # timings this close are scheduler noise, not regressions
+
+def load_script(filename, name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def synth_sections(templates, n, seed=0):
+    rng = random.Random(seed)
+    sections = []
+    for i in range(n):
+        t = rng.choice(templates)
+        slug = t["id"].split("-", 1)[-1]
+        sections.append({"id": f"{i + 1:06d}-{slug}", "label": t["label"], "dur": t["dur"], "subs": list(t["subs"])})
+    return sections
+
+def stub_run_jobs(jobs, on_done=None, **options):
+    """Stand-in for the ffmpeg runner: create each job's outputs and report success."""
+    for job in jobs:
+        for outfile in job.outputs:
+            with open(outfile, "wb"):
+                pass
+        job.returncode = 0
+        if on_done is not None:
+            on_done(job)
+    return jobs
+
+def measure(fn, repeats):
+    """(best wall seconds, peak traced bytes, result). Memory is traced on a separate run."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+def bench(sizes, repeats, max_placeholders):
+    prproj = load_script("generate-prproj-xml.py", "generate_prproj_xml")
+    package.run_jobs = stub_run_jobs
+    templates = SECTIONS_V1 + SECTIONS_V2
+
+    results = {}
+    for n in sizes:
+        sections = synth_sections(templates, n)
+        timeline = Timeline(sections, DEFAULT_TARGET.fps)
+        reps = repeats if n <= 10_000 else 1
+        with tempfile.TemporaryDirectory() as tmp:
+            xml_path = os.path.join(tmp, "ai-selves-leti.xml")
+            srt_path = os.path.join(tmp, "ai-selves-leti.srt")
+            prproj_path = os.path.join(tmp, "prproj.xml")
+
+            def run_prproj():
+                with open(prproj_path, "w", encoding="utf-8") as f:
+                    prproj.build_xml(f, timeline)
+
+            emitters = {
+                "xml": (lambda: package.generate_xml(tmp, timeline), xml_path),
+                "srt": (lambda: package.generate_srt(tmp, timeline), srt_path),
+                "prproj-xml": (run_prproj, prproj_path),
+            }
+            for name, (fn, path) in emitters.items():
+                wall, peak, _ = measure(fn, reps)
+                results[f"{name}/{n}"] = {"wall_s": wall, "peak_bytes": peak, "out_bytes": os.path.getsize(path)}
+
+            if n <= max_placeholders:
+                for backend in ("per-clip", "graph"):
+                    def run_placeholders():
+                        # Fresh cache and package each time so every clip is a miss
+                        with tempfile.TemporaryDirectory() as ph_tmp:
+                            cache = package.PlaceholderCache(os.path.join(ph_tmp, "cache"), max_bytes=2**40)
+                            targets = [(os.path.join(ph_tmp, "pkg"), c, DEFAULT_TARGET) for c in timeline.clips]
+                            package.generate_placeholders(targets, cache, jobs=os.cpu_count(), backend=backend)
+                    wall, peak, _ = measure(run_placeholders, reps)
+                    results[f"placeholders-{backend}/{n}"] = {
+                        "wall_s": wall, "peak_bytes": peak, "clips_per_s": n / wall if wall else None,
+                    }
+        print(f"  ✓ {n} sections", file=sys.stderr)
+    return results
+
+def compare(results, baseline, threshold):
+    """Return (name, metric, old, new) for every metric that regressed past the threshold."""
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        for metric in ("wall_s", "peak_bytes"):
+            if not old.get(metric) or new[metric] <= old[metric] * (1 + threshold):
+                continue
+            if metric == "wall_s" and new[metric] - old[metric] < NOISE_FLOOR_S:
+                continue
+            regressions.append((name, metric, old[metric], new[metric]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="20,100,1000,10000,100000",
+                        help="comma-separated section counts (default: 20,100,1000,10000,100000)")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per measurement, best kept (default: 3)")
+    parser.add_argument("--max-placeholders", type=int, default=10_000,
+                        help="largest size to run the stubbed placeholder benchmark on (default: 10000)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help=f"baseline file (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline, exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown/memory growth before flagging, as a fraction (default: 0.25)")
+    parser.add_argument("--json", help="also write the raw results here")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = bench(sizes, args.repeats, args.max_placeholders)
+
+    print(f"{'benchmark':<28} {'time':>10} {'peak mem':>10} {'output':>10}")
+    for name, r in results.items():
+        out = f"{r['out_bytes'] / 2**20:.2f}MB" if "out_bytes" in r else f"{r['clips_per_s']:.0f}/s"
+        print(f"{name:<28} {r['wall_s'] * 1000:>8.1f}ms {r['peak_bytes'] / 2**20:>8.2f}MB {out:>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    status = 0
+    if args.compare:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)["results"]
+        except OSError:
+            sys.exit(f"no baseline at {args.baseline}; run with --save-baseline first")
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"  ❌ {name} {metric}: {old:.4g} → {new:.4g} (+{(new / old - 1) * 100:.0f}%)")
+        if regressions:
+            status = 1
+        else:
+            print(f"  ✓ no regressions past {args.threshold:.0%} against {args.baseline}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"saved_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "results": results}, f, indent=2)
+        print(f"  ✓ baseline saved to {args.baseline}")
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
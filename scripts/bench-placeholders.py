@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Benchmark placeholder backends: one ffmpeg per clip vs one ffmpeg graph for all clips.
+
+Runs against the real V1 (18 sections) and V2 (19 sections) cuts with a cold
+cache every time, so each run measures a full set of encodes.
+
+    python3 scripts/bench-placeholders.py [--runs 3] [--jobs N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+from premiere_kit.cuts import CUTS
+from premiere_kit.package import PlaceholderCache, generate_placeholders
+from premiere_kit.targets import DEFAULT as DEFAULT_TARGET
+from premiere_kit.timeline import Timeline
+
+def time_backend(sections, backend, jobs):
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PlaceholderCache(os.path.join(tmp, "cache"), max_bytes=2**40)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            targets = [(os.path.join(tmp, "pkg"), c, DEFAULT_TARGET) for c in Timeline(sections, DEFAULT_TARGET.fps).clips]
+            generate_placeholders(targets, cache, jobs=jobs, backend=backend)
+        return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"{'cut':<4} {'sections':>8}  {'backend':<9} {'median':>8} {'min':>8}")
+    for version, cut in CUTS.items():
+        results = {}
+        for backend in ("per-clip", "graph"):
+            times = [time_backend(cut.sections, backend, args.jobs) for _ in range(args.runs)]
+            results[backend] = statistics.median(times)
+            print(f"{version:<4} {len(cut.sections):>8}  {backend:<9} {results[backend]:>7.2f}s {min(times):>7.2f}s")
+        print(f"     graph speedup: {results['per-clip'] / results['graph']:.2f}x (jobs={args.jobs})\n")
+
+if __name__ == "__main__":
+    main()
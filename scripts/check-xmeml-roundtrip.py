@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Check that every cut survives export → import-xmeml.py unchanged, flat and with --acts.
+
+Each cut is exported to xmeml in memory at every rate, read back with the
+importer and compiled again; the rate, clip spans, labels and subtitles
+must match frame for frame. Exits 1 if any cut does not.
+
+    python3 scripts/check-xmeml-roundtrip.py [--cuts v1,v2,mochi=edit_spec.json] [--rates 24,29.97]
+"""
+
+import argparse
+import io
+import sys
+
+from premiere_kit.cuts import CUTS, load_cut
+from premiere_kit.export import XmemlActsSink, XmemlSink, export
+from premiere_kit.rates import parse_rate, rate_label
+from premiere_kit.timeline import Timeline
+from premiere_kit.xmeml_import import import_xmeml
+
+def snapshot(timeline):
+    """What a round trip must preserve: spans and labels of the clips, spans and text of the cues."""
+    return ([(c.start, c.end, c.section["label"]) for c in timeline.clips],
+            sorted((c.start, c.end, c.text) for c in timeline.cues))
+
+def roundtrip(timeline, acts):
+    buf = io.StringIO()
+    sink = (XmemlActsSink if acts else XmemlSink)(buf, timeline.fps, "check", "check", media_ext=None)
+    export(timeline, [sink])
+    sections, rate = import_xmeml(io.BytesIO(buf.getvalue().encode()))
+    return Timeline(sections, rate), rate
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cuts", default=",".join(CUTS), help="comma-separated cuts, as for gen-premiere-package.py")
+    parser.add_argument("--rates", default="24,29.97", help="comma-separated frame rates to export at")
+    args = parser.parse_args()
+    try:
+        rates = [parse_rate(r) for r in args.rates.split(",") if r.strip()]
+    except ValueError as e:
+        raise SystemExit(f"❌ --rates: {e}")
+
+    failed = False
+    for spec in (s.strip() for s in args.cuts.split(",") if s.strip()):
+        try:
+            cut = load_cut(spec)
+        except ValueError as e:
+            raise SystemExit(f"❌ {e}")
+        name = cut.name
+        for fps in rates:
+            timeline = Timeline(cut.sections, fps)
+            expected = snapshot(timeline)
+            for acts in (False, True):
+                mode = f"{rate_label(fps)}fps, " + (f"{len(timeline.acts)} acts" if acts else "flat")
+                imported, rate = roundtrip(timeline, acts)
+                got = snapshot(imported)
+                if got == expected and rate == fps:
+                    print(f"  ✓ {name} ({mode}): {len(got[0])} sections, {len(got[1])} subtitles")
+                    continue
+                failed = True
+                diff = next((f"clip {i + 1}: {a} != {b}" for i, (a, b) in enumerate(zip(expected[0], got[0]))
+                             if a != b), f"{len(got[0])} sections for {len(expected[0])}")
+                if got[0] == expected[0]:
+                    diff = f"{len(got[1])} subtitles for {len(expected[1])}"
+                if rate != fps:
+                    diff = f"read back at {rate_label(rate)}fps"
+                print(f"❌ {name} ({mode}): {diff}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
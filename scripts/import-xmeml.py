@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Import an edited xmeml sequence as a cut for gen-premiere-package.py.
+
+    python3 scripts/import-xmeml.py premiere/ai-selves-v6.xml -o cuts/v6.json
+    python3 scripts/gen-premiere-package.py --cuts v6=cuts/v6.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from premiere_kit.rates import rate_label
+from premiere_kit.timeline import Timeline
+from premiere_kit.xmeml_import import import_xmeml
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("xml", help="xmeml file exported from Premiere (or one of ours)")
+    parser.add_argument("-o", "--output", help="write the cut JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    sections, timebase = import_xmeml(args.xml)
+    # NTSC rates as "30000/1001", which parse_rate() reads back exactly
+    cut = {"fps": timebase if isinstance(timebase, int) else str(timebase), "sections": sections}
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(cut, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+    else:
+        json.dump(cut, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    timeline = Timeline(sections, timebase)
+    print(f"✓ {len(timeline.clips)} sections, {len(timeline.cues)} subtitles, "
+          f"{timeline.frames} frames @ {rate_label(timebase)}fps", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
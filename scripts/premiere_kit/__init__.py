@@ -0,0 +1,4 @@
+"""Shared building blocks for the Premiere package generators in scripts/.
+
+`premiere_kit.package` is the in-process API the scripts are thin wrappers around.
+"""
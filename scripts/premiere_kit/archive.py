@@ -0,0 +1,146 @@
+"""Write packages straight into a .tar.gz or .zip, with no staging directory.
+
+Artifacts are added as soon as they are finished: files (placeholders,
+docs) are streamed from where they already are, and generated text (XML,
+SRT, ...) is written into a member that is spooled in memory, or on disk
+once it grows large, and appended when closed. Tar cannot take a member of
+unknown size, so the spool is needed there too.
+
+Members added with the same content key are stored once. Tar archives
+record the repeats as hardlinks to the first copy, which every tar
+extracts as ordinary files. Zip has no links, so repeats are stored again.
+
+Every member's sha256 is recorded in `digests`, which is what the
+package manifests are made from. Given `skip` ({path: sha256} of a
+previous release), members whose checksum is unchanged are recorded but
+not stored, which turns the archive into a delta.
+"""
+
+import io
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+
+from premiere_kit.build import file_digest
+from premiere_kit.delta import stream_digest
+
+SPOOL_MAX = 8 << 20
+SUFFIXES = (".tar.gz", ".tgz", ".zip")
+
+
+class _Member:
+    """Writable text member; added to the archive on close()."""
+
+    def __init__(self, archive, arcname, always):
+        self.archive = archive
+        self.arcname = arcname
+        self.always = always
+        self.spool = tempfile.SpooledTemporaryFile(SPOOL_MAX)
+        self.text = io.TextIOWrapper(self.spool, encoding="utf-8")
+
+    def write(self, data):
+        return self.text.write(data)
+
+    def close(self):
+        self.text.flush()
+        self.text.detach()
+        self.archive._add_spooled(self.arcname, self.spool, time.time(), self.always)
+
+
+class PackageArchive:
+    def __init__(self, path, skip=None):
+        if not path.endswith(SUFFIXES):
+            raise ValueError(f"unsupported archive {path!r} (use {', '.join(SUFFIXES)})")
+        self.path = path
+        self.skip = skip or {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if path.endswith(".zip"):
+            self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+            self.tar = None
+        else:
+            self.tar = tarfile.open(path, "w:gz")
+            self.zip = None
+        self.first = {}    # content key -> arcname it was first stored under
+        self.digests = {}  # arcname -> (sha256, size), stored or not
+        self.stored = []
+        self.links = 0
+
+    @property
+    def members(self):
+        return len(self.digests)
+
+    def open(self, arcname, always=False):
+        """A text file handle whose contents become `arcname` when closed.
+
+        `always` stores it even when unchanged from `skip` (manifests).
+        """
+        return _Member(self, arcname, always)
+
+    def _unchanged(self, arcname, sha, always):
+        return not always and self.skip.get(arcname) == sha
+
+    def add_file(self, arcname, src, key=None):
+        """Add the file at `src`; with a `key` seen before, store a link to the first copy instead."""
+        sha = file_digest(src)
+        self.digests[arcname] = (sha, os.path.getsize(src))
+        if self._unchanged(arcname, sha, False):
+            return
+        self.stored.append(arcname)
+        if key is not None and key in self.first and self.tar is not None:
+            info = tarfile.TarInfo(arcname)
+            info.type = tarfile.LNKTYPE
+            info.linkname = self.first[key]
+            info.mtime = os.path.getmtime(src)
+            info.mode = 0o644
+            self.tar.addfile(info)
+            self.links += 1
+            return
+        if key is not None:
+            self.first.setdefault(key, arcname)
+        if self.tar is not None:
+            with open(src, "rb") as f:
+                info = self.tar.gettarinfo(fileobj=f, arcname=arcname)
+                info.uid = info.gid = 0
+                info.uname = info.gname = ""
+                self.tar.addfile(info, f)
+        else:
+            self.zip.write(src, arcname)
+
+    def add_stream(self, arcname, fh, mtime=None):
+        """Add the rest of binary file object `fh` as `arcname`."""
+        spool = tempfile.SpooledTemporaryFile(SPOOL_MAX)
+        while chunk := fh.read(1 << 20):
+            spool.write(chunk)
+        self._add_spooled(arcname, spool, time.time() if mtime is None else mtime, False)
+
+    def _add_spooled(self, arcname, spool, mtime, always):
+        spool.seek(0)
+        sha, size = stream_digest(spool)
+        self.digests[arcname] = (sha, size)
+        if self._unchanged(arcname, sha, always):
+            spool.close()
+            return
+        self.stored.append(arcname)
+        spool.seek(0)
+        if self.tar is not None:
+            info = tarfile.TarInfo(arcname)
+            info.size = size
+            info.mtime = mtime
+            info.mode = 0o644
+            self.tar.addfile(info, spool)
+        else:
+            with self.zip.open(zipfile.ZipInfo(arcname, time.localtime(mtime)[:6]), "w") as out:
+                while chunk := spool.read(1 << 20):
+                    out.write(chunk)
+        spool.close()
+
+    def close(self):
+        (self.tar or self.zip).close()
+
+    def abort(self):
+        """Close and delete a half-written archive."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
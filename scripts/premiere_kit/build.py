@@ -0,0 +1,107 @@
+"""Make-style incremental builds for generated packages.
+
+Every artifact in an output directory (each placeholder, the SRT, the XML,
+copied docs) is registered with a hash of everything it is built from.
+The hashes are recorded in a manifest inside the output directory, so a
+rerun only rebuilds artifacts whose inputs changed or whose output went
+missing, and can say why.
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST = ".build-manifest.json"
+
+
+def digest(*parts):
+    """Stable hash of JSON-serialisable parts (Fractions as "n/d"); iterables are hashed item by item."""
+    h = hashlib.sha256()
+    for part in parts:
+        items = part if isinstance(part, (list, tuple)) or hasattr(part, "__next__") else [part]
+        for item in items:
+            h.update(json.dumps(item, sort_keys=True, ensure_ascii=False, default=str).encode())
+            h.update(b"\n")
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class BuildGraph:
+    """Tracks which artifacts of one output directory need rebuilding.
+
+    Call target() for every artifact the build produces; it returns why the
+    artifact must be rebuilt, or None when it is up to date. finish() drops
+    outputs that are no longer produced, and subdirectories that leaves
+    empty, and records the new manifest. If the
+    build dies before finish(), the old manifest stays and anything touched
+    is rebuilt next time.
+    """
+
+    def __init__(self, out_dir, force=False):
+        self.out_dir = out_dir
+        self.force = force
+        self.path = os.path.join(out_dir, MANIFEST)
+        try:
+            with open(self.path) as f:
+                self.previous = json.load(f)
+        except (OSError, ValueError):
+            self.previous = {}
+        self.current = {}
+        self.rebuilt = {}
+        self.skipped = []
+        self.removed = []
+
+    def target(self, relpath, inputs_hash):
+        self.current[relpath] = inputs_hash
+        if self.force:
+            reason = "forced"
+        elif relpath not in self.previous:
+            reason = "new"
+        elif not os.path.exists(os.path.join(self.out_dir, relpath)):
+            reason = "output missing"
+        elif self.previous[relpath] != inputs_hash:
+            reason = "inputs changed"
+        else:
+            self.skipped.append(relpath)
+            return None
+        self.rebuilt[relpath] = reason
+        return reason
+
+    def finish(self):
+        emptied = set()
+        for relpath in sorted(set(self.previous) - set(self.current)):
+            path = os.path.join(self.out_dir, relpath)
+            if os.path.exists(path):
+                os.remove(path)
+            self.removed.append(relpath)
+            if os.path.dirname(relpath):
+                emptied.add(os.path.dirname(path))
+        # Subdirectories nothing is built into any more (acts/ after --acts is dropped) go too
+        for dirpath in sorted(emptied, reverse=True):
+            if os.path.isdir(dirpath) and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+        with open(self.path, "w") as f:
+            json.dump(self.current, f, indent=2, sort_keys=True)
+
+    def report(self):
+        """Lines describing what was rebuilt and removed; big directories are folded."""
+        groups = {}
+        entries = [("↻", p, r) for p, r in self.rebuilt.items()] + [("✗", p, "no longer produced") for p in self.removed]
+        for mark, relpath, reason in entries:
+            groups.setdefault((mark, os.path.dirname(relpath), reason), []).append(relpath)
+        for (mark, dirname, reason), paths in groups.items():
+            if dirname and len(paths) > 3:
+                yield f"{mark} {dirname}/ ×{len(paths)} ({reason})"
+            else:
+                yield from (f"{mark} {p} ({reason})" for p in paths)
+
+    def summary(self):
+        return f"{len(self.rebuilt)} rebuilt, {len(self.skipped)} skipped (inputs unchanged), {len(self.removed)} removed"
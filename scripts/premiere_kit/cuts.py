@@ -0,0 +1,312 @@
+"""The cuts the generators know by name, as section lists.
+
+A section is {"id", "label", "dur", "subs"}: a duration in seconds and
+subtitles as (start, dur, text) relative to the section start. A section
+with an "act" name starts that act, which runs until the next one; acts
+become nested sequences with --acts. Other cuts
+are loaded from JSON files in the same shape, or from Remotion edit specs
+(see premiere_kit.editspec), with `load_cut()`.
+
+Every cut is a `Cut`: besides its sections and output folder it names
+the Premiere project and sequence of its XML and the directed script
+copied into its package, so a batch of cuts keeps each cut's own.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+from premiere_kit.editspec import is_edit_spec, spec_sections
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Cut(namedtuple("Cut", "name sections out_dir project sequence docs", defaults=(None, None, None))):
+    """One cut to package. `project`/`sequence` name the XML (default: the cut's name); `docs` is a file or None."""
+    __slots__ = ()
+
+    @property
+    def project_name(self):
+        return self.project or self.name
+
+    @property
+    def sequence_name(self):
+        return self.sequence or self.project_name
+
+# ── V1 FULL (76s) ──────────────────────────────────────────────────────────
+SECTIONS_V1 = [
+    {"id": "01-intro", "act": "INTRO", "label": "INTRO — Leti to camera", "dur": 8, "subs": [
+        (0, 2.5, "You're not gonna believe this but —"),
+        (2.5, 2.5, "our company used our own product, AI Selves,"),
+        (5, 1.5, "to push the actual product."),
+        (7, 1, "Let me explain."),
+    ]},
+    {"id": "02-anthony-intro", "act": "ANTHONY + THEO", "label": "ANTHONY — Real photo + title", "dur": 4, "subs": [
+        (0, 3, "This is Anthony, our head of partnerships."),
+        (3, 1, "And this is Theo."),
+    ]},
+    {"id": "03-theo-reveal", "label": "THEO — Avatar reveal + ding SFX", "dur": 7, "subs": [
+        (0, 1.5, "(his AI Self)"),
+        (1.5, 2.5, "Theo monitors our brand mentions in real time —"),
+        (4, 2, "and helped Anthony evaluate partnership opportunities"),
+        (6, 1, "around the clock for the launch."),
+    ]},
+    {"id": "04-starry-intro", "act": "STARRY + MOMO", "label": "STARRY — Real photo + title", "dur": 3, "subs": [
+        (0, 2, "Starry, our product manager —"),
+        (2, 1, "uses Momo."),
+    ]},
+    {"id": "05-momo-reveal", "label": "MOMO — Avatar reveal + ding SFX", "dur": 6, "subs": [
+        (0, 1, "(her AI Self)"),
+        (1, 0.8, "CUTE."),
+        (1.8, 2.2, "Momo handles Linear tasks across all departments —"),
+        (4, 2, "and even goes on Zoom calls when Starry doesn't feel like it!"),
+    ]},
+    {"id": "06-rus-intro", "act": "RUS + RUSS", "label": "RUS — Real photo + title", "dur": 3, "subs": [
+        (0, 2, "Rus, our head of design —"),
+        (2, 1, "uses Russ."),
+    ]},
+    {"id": "07-russ-reveal", "label": "RUSS — Avatar reveal + ding SFX", "dur": 4, "subs": [
+        (0, 1, "(his AI Self)"),
+        (1, 1.5, "Russ goes over design issues"),
+        (2.5, 1.5, "and communicates them to the design team."),
+    ]},
+    {"id": "08-matan-intro", "act": "MATAN + RACCOON", "label": "MATAN — Real photo + title", "dur": 3, "subs": [
+        (0, 2.5, "And this is Matan, our Creative Director."),
+    ]},
+    {"id": "09-raccoon-reveal", "label": "RACCOON 2.0 — Avatar reveal + ding SFX", "dur": 5, "subs": [
+        (0, 1.5, "His Raccoon 2.0 — (his AI Self)"),
+        (1.5, 1.5, "helps Matan bridge the gap between"),
+        (3, 2, "our researchers and our Creative team."),
+    ]},
+    {"id": "10-demi-intro", "act": "DEMI + SEMI", "label": "DEMI — Real photo + title", "dur": 3, "subs": [
+        (0, 3, "Oh, and all of them report up to our CEO, Demi Guo."),
+    ]},
+    {"id": "11-semi-reveal", "label": "SEMI — Avatar reveal + ding SFX", "dur": 6, "subs": [
+        (0, 1.5, "Well… not exactly."),
+        (1.5, 1.5, "They report to Semi — (her AI Self)"),
+        (3, 1.5, "and Semi reports back to her."),
+        (4.5, 1.5, "Because Demi is waaaay too busy."),
+    ]},
+    {"id": "12-leti-intro", "act": "THE ENDING", "label": "LETI — To camera (THE ENDING)", "dur": 4, "subs": [
+        (0, 3, "And me? I'm Leti, and I usually make videos, buuuut—"),
+        (3, 0.5, "[MEOW]"),
+    ]},
+    {"id": "13-mochi-reveal", "label": "MOCHI — Hard cut, smashing keyboard", "dur": 4, "subs": [
+        (0, 1.5, "(my AI Self)"),
+    ]},
+    {"id": "14-leti-interrupted", "label": "LETI — Offscreen annoyed", "dur": 3, "subs": [
+        (0, 2.5, "Mochi— ffs, I'm in the middle of introducing yo—"),
+    ]},
+    {"id": "15-mochi-glitch", "label": "MOCHI — Glitch cut, looking annoyed", "dur": 2, "subs": []},
+    {"id": "16-leti-comeback", "label": "LETI — Tries to recover", "dur": 2, "subs": [
+        (0, 1.5, "Anyways, I'm—"),
+    ]},
+    {"id": "17-mochi-glitch-2", "label": "MOCHI — Glitch, looking at camera", "dur": 5, "subs": [
+        (0, 2, "What?? What do you need from me—"),
+        (2, 1.5, "oh. Oh! You're done editing the video?"),
+        (3.5, 1.5, "Ok ok lemme check it out."),
+    ]},
+    {"id": "18-loop-zoom", "label": "ZOOM INTO SCREEN → LOOP", "dur": 4, "subs": [
+        (2, 2, '"You\'re not gonna believe this but—"'),
+    ]},
+]
+
+
+# ── V2 TIGHT (40s) ─────────────────────────────────────────────────────────
+SECTIONS_V2 = [
+    {"id": "01-hook", "act": "HOOK", "label": "HOOK — Text card or to camera", "dur": 4, "subs": [
+        (0, 2.5, "You're not gonna believe this but —"),
+        (2.5, 1.5, "our company used our own product, AI Selves, to push the actual product."),
+    ]},
+    {"id": "02-explain", "label": "LET ME EXPLAIN — Beat", "dur": 1, "subs": [
+        (0, 1, "Let me explain."),
+    ]},
+    {"id": "03-anthony", "act": "ANTHONY + THEO", "label": "ANTHONY — Photo + title", "dur": 2, "subs": [
+        (0, 1.5, "This is Anthony, our head of partnerships."),
+        (1.5, 0.5, "And this is Theo."),
+    ]},
+    {"id": "04-theo", "label": "THEO — Avatar + ding + (his AI Self)", "dur": 2, "subs": [
+        (0, 0.5, "(his AI Self)"),
+        (0.5, 1.5, "Theo monitors brand mentions in real time"),
+    ]},
+    {"id": "05-theo-work", "label": "THEO WORK — Scanning UI + Slack", "dur": 4, "subs": [
+        (0, 2, "and helped Anthony evaluate partnerships around the clock"),
+        (2, 2, "for the launch."),
+    ]},
+    {"id": "06-montage-starry", "act": "RAPID MONTAGE", "label": "RAPID — Starry → Momo + ding", "dur": 1.3, "subs": [
+        (0, 0.6, "Starry — Momo"),
+        (0.6, 0.7, "(her AI Self)"),
+    ]},
+    {"id": "07-montage-rus", "label": "RAPID — Rus → Russ + ding", "dur": 1.3, "subs": [
+        (0, 0.6, "Rus — Russ"),
+        (0.6, 0.7, "(his AI Self)"),
+    ]},
+    {"id": "08-montage-matan", "label": "RAPID — Matan → Raccoon 2.0 + ding", "dur": 1.4, "subs": [
+        (0, 0.6, "Matan — Raccoon 2.0"),
+        (0.6, 0.8, "(his AI Self)"),
+    ]},
+    {"id": "09-demi", "act": "DEMI + SEMI", "label": "DEMI — Photo + CEO title", "dur": 2, "subs": [
+        (0, 2, "Oh, and all of them report up to our CEO, Demi Guo."),
+    ]},
+    {"id": "10-not-exactly", "label": "BEAT — Well not exactly", "dur": 1.5, "subs": [
+        (0, 1.5, "Well… not exactly."),
+    ]},
+    {"id": "11-semi", "label": "SEMI — Avatar + ding + (her AI Self)", "dur": 1.5, "subs": [
+        (0, 1, "They report to Semi —"),
+        (0, 1, "(her AI Self)"),
+    ]},
+    {"id": "12-demi-busy", "label": "DEMI BUSY — Calendar + punchline", "dur": 2, "subs": [
+        (0, 1, "and Semi reports back to her."),
+        (1, 1, "Because Demi is waaaay too busy."),
+    ]},
+    {"id": "13-leti-intro", "act": "THE ENDING", "label": "LETI — To camera normal intro", "dur": 3, "subs": [
+        (0, 2.5, "And me? I'm Leti, and I usually make videos, buuuut—"),
+        (2.5, 0.5, "[MEOW]"),
+    ]},
+    {"id": "14-mochi-reveal", "label": "MOCHI — Hard cut smashing keyboard", "dur": 3, "subs": [
+        (0, 1.5, "(my AI Self)"),
+    ]},
+    {"id": "15-leti-annoyed", "label": "LETI OFFSCREEN — ffs introducing yo—", "dur": 2, "subs": [
+        (0, 2, "Mochi— ffs, I'm in the middle of introducing yo—"),
+    ]},
+    {"id": "16-mochi-glitch", "label": "GLITCH — Mochi stares annoyed", "dur": 1, "subs": []},
+    {"id": "17-leti-comeback", "label": "LETI — Anyways I'm—", "dur": 1.5, "subs": [
+        (0, 1, "Anyways, I'm—"),
+    ]},
+    {"id": "18-mochi-done", "label": "MOCHI — oh you're done editing?", "dur": 3.5, "subs": [
+        (0, 1.5, "What?? What do you need from me—"),
+        (1.5, 1, "oh. Oh! You're done editing the video?"),
+        (2.5, 1, "Ok ok lemme check it out."),
+    ]},
+    {"id": "19-loop-zoom", "label": "ZOOM INTO SCREEN → LOOP", "dur": 2, "subs": [
+        (1, 1, '"You\'re not gonna believe this but—"'),
+    ]},
+]
+
+
+# version -> Cut
+CUTS = {
+    "v1": Cut("v1", SECTIONS_V1, "premiere/ai-selves-leti-v1", "AI Selves Leti v1", "AI Selves Leti — 76s Cut",
+              os.path.join(SCRIPTS_DIR, "ai-selves-leti-v1.md")),
+    "v2": Cut("v2", SECTIONS_V2, "premiere/ai-selves-leti-v2", "AI Selves Leti v2", "AI Selves Leti — 40s Cut",
+              os.path.join(SCRIPTS_DIR, "ai-selves-leti-v2-directed.md")),
+}
+
+
+# The v2 cut as generate-prproj-xml.py has always labelled it
+SECTIONS_PRPROJ = [
+    # ── HOOK (5s) ──
+    {"id": "hook", "act": "HOOK", "label": "HOOK — Text card or to camera", "dur": 4, "subs": [
+        (0, 2.5, "You're not gonna believe this but —"),
+        (2.5, 1.5, "our company used our own product, AI Selves, to push the actual product."),
+    ]},
+    {"id": "explain", "label": "LET ME EXPLAIN — Beat", "dur": 1, "subs": [
+        (0, 1, "Let me explain."),
+    ]},
+
+    # ── ANTHONY + THEO — Full intro (8s) ──
+    {"id": "anthony", "act": "ANTHONY + THEO", "label": "ANTHONY — Photo + title (Head of Partnerships)", "dur": 2, "subs": [
+        (0, 1.5, "This is Anthony, our head of partnerships."),
+        (1.5, 0.5, "And this is Theo."),
+    ]},
+    {"id": "theo", "label": "THEO — Avatar + ding + (his AI Self)", "dur": 2, "subs": [
+        (0, 0.5, "(his AI Self)"),
+        (0.5, 1.5, "Theo monitors brand mentions in real time"),
+    ]},
+    {"id": "theo-work", "label": "THEO WORK — Scanning UI + Slack", "dur": 4, "subs": [
+        (0, 2, "and helped Anthony evaluate partnerships around the clock"),
+        (2, 2, "for the launch."),
+    ]},
+
+    # ── RAPID MONTAGE: Starry/Momo, Rus/Russ, Matan/Raccoon (4s) ──
+    {"id": "montage-starry", "act": "RAPID MONTAGE", "label": "RAPID — Starry photo → Momo avatar + ding", "dur": 1.3, "subs": [
+        (0, 0.6, "Starry — Momo"),
+        (0.6, 0.7, "(her AI Self)"),
+    ]},
+    {"id": "montage-rus", "label": "RAPID — Rus photo → Russ avatar + ding", "dur": 1.3, "subs": [
+        (0, 0.6, "Rus — Russ"),
+        (0.6, 0.7, "(his AI Self)"),
+    ]},
+    {"id": "montage-matan", "label": "RAPID — Matan photo → Raccoon 2.0 avatar + ding", "dur": 1.4, "subs": [
+        (0, 0.6, "Matan — Raccoon 2.0"),
+        (0.6, 0.8, "(his AI Self)"),
+    ]},
+
+    # ── DEMI + SEMI — Hierarchy punchline (7s) ──
+    {"id": "demi", "act": "DEMI + SEMI", "label": "DEMI — Photo + CEO title", "dur": 2, "subs": [
+        (0, 2, "Oh, and all of them report up to our CEO, Demi Guo."),
+    ]},
+    {"id": "not-exactly", "label": "BEAT — 'Well… not exactly.'", "dur": 1.5, "subs": [
+        (0, 1.5, "Well… not exactly."),
+    ]},
+    {"id": "semi", "label": "SEMI — Avatar + ding + (her AI Self)", "dur": 1.5, "subs": [
+        (0, 1, "They report to Semi —"),
+        (0, 1, "(her AI Self)"),
+    ]},
+    {"id": "demi-busy", "label": "DEMI BUSY — Calendar + punchline", "dur": 2, "subs": [
+        (0, 1, "and Semi reports back to her."),
+        (1, 1, "Because Demi is waaaay too busy."),
+    ]},
+
+    # ── THE ENDING (16s) ──
+    {"id": "leti-intro", "act": "THE ENDING", "label": "LETI — To camera, normal intro", "dur": 3, "subs": [
+        (0, 2.5, "And me? I'm Leti, and I usually make videos, buuuut—"),
+        (2.5, 0.5, "[MEOW]"),
+    ]},
+    {"id": "mochi-reveal", "label": "MOCHI — Hard cut, smashing keyboard, 2 monitors", "dur": 3, "subs": [
+        (0, 1.5, "(my AI Self)"),
+    ]},
+    {"id": "leti-annoyed", "label": "LETI OFFSCREEN — 'ffs I'm in the middle of introducing yo—'", "dur": 2, "subs": [
+        (0, 2, "Mochi— ffs, I'm in the middle of introducing yo—"),
+    ]},
+    {"id": "mochi-glitch", "label": "GLITCH — Mochi stares at camera annoyed", "dur": 1, "subs": []},
+    {"id": "leti-comeback", "label": "LETI — 'Anyways, I'm—' (gets cut off again)", "dur": 1.5, "subs": [
+        (0, 1, "Anyways, I'm—"),
+    ]},
+    {"id": "mochi-done", "label": "MOCHI GLITCH — Leti: 'oh you're done?'", "dur": 3.5, "subs": [
+        (0, 1.5, "What?? What do you need from me—"),
+        (1.5, 1, "oh. Oh! You're done editing the video?"),
+        (2.5, 1, "Ok ok lemme check it out."),
+    ]},
+    {"id": "loop-zoom", "label": "ZOOM INTO MOCHI SCREEN → LOOP ∞", "dur": 2, "subs": [
+        (1, 1, '"You\'re not gonna believe this but—"'),
+    ]},
+]
+
+
+def load_cut(spec, known=CUTS):
+    """Resolve a --cuts entry: a known version name, or `name=path.json`. Returns a Cut.
+
+    Cut files hold a list of sections (or {"sections": [...]}) in the same
+    shape as SECTIONS_V1/SECTIONS_V2, with subs as [start, dur, text], or
+    are an edit spec with frame-timed "scenes" (packaged under
+    premiere/PROJECT-NAME and named after its "project"). The dict form
+    may also set "project" and "sequence" names and a "docs" file, relative
+    to the cut file. Raises ValueError for unknown names, unreadable files and
+    malformed specs.
+    """
+    if "=" not in spec:
+        if spec not in known:
+            raise ValueError(f"unknown cut {spec!r} (known: {', '.join(sorted(known))}, or name=path.json)")
+        return known[spec]
+    name, path = spec.split("=", 1)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except OSError as e:
+        raise ValueError(f"cannot read cut {name!r} from {path}: {e.strerror or e}") from None
+    except ValueError as e:
+        raise ValueError(f"{path}: not valid JSON ({e})") from None
+    if is_edit_spec(data):
+        try:
+            sections = spec_sections(data)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{path}: not a valid edit spec ({type(e).__name__}: {e})") from None
+        return Cut(name, sections, f"premiere/{data.get('project', 'ai-selves-leti')}-{name}", data.get("project"))
+    if not isinstance(data, dict):
+        return Cut(name, data, f"premiere/ai-selves-leti-{name}")
+    docs = data.get("docs")
+    return Cut(name, data["sections"], f"premiere/ai-selves-leti-{name}", data.get("project"), data.get("sequence"),
+               os.path.join(os.path.dirname(path), docs) if docs else None)
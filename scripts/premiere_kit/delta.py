@@ -0,0 +1,175 @@
+"""Checksummed package manifests and delta packages.
+
+Every generated package carries `package-manifest.json`, which records
+the sha256 and size of each file, relative to the package folder. A delta
+is an ordinary package archive that holds only the files whose checksum
+differs from a base release, plus every package's full manifest and a
+`DELTA.json` at the root that lists the stored and removed paths.
+`apply_delta()` rebuilds the full packages from the base and the delta,
+and verifies every file against the new manifests on the way.
+
+Bases without manifests (the hand-made release tarballs) are checksummed
+member by member instead.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import zipfile
+
+MANIFEST = "package-manifest.json"
+DELTA = "DELTA.json"
+
+
+def stream_digest(fh):
+    """(sha256 hex, size) of everything left in a binary file object."""
+    h = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: fh.read(1 << 20), b""):
+        h.update(chunk)
+        size += len(chunk)
+    return h.hexdigest(), size
+
+
+def manifest_json(package, digests):
+    """Manifest text for `package` from {relpath: (sha256, size)}."""
+    files = {rel: {"sha256": sha, "size": size} for rel, (sha, size) in sorted(digests.items())}
+    return json.dumps({"package": package, "files": files}, indent=2, ensure_ascii=False) + "\n"
+
+
+def dir_digests(root):
+    """{relpath: (sha256, size)} for every file under `root`, skipping dotfiles and the manifest."""
+    digests = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name.startswith(".") or name == MANIFEST:
+                continue
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                digests[os.path.relpath(path, root).replace(os.sep, "/")] = stream_digest(f)
+    return digests
+
+
+def _clean(name):
+    return name[2:] if name.startswith("./") else name
+
+
+def iter_archive(path):
+    """Yield (member name, binary file object) for every regular file in a tar or zip."""
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as z:
+            for info in z.infolist():
+                if not info.is_dir():
+                    with z.open(info) as f:
+                        yield _clean(info.filename), f
+    else:
+        with tarfile.open(path) as tar:
+            for member in tar:
+                if member.isfile() or member.islnk():
+                    with tar.extractfile(member) as f:
+                        yield _clean(member.name), f
+
+
+def iter_base(path):
+    """Like iter_archive(), for a base that is an archive or an unpacked directory."""
+    if os.path.isdir(path):
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for name in sorted(filenames):
+                full = os.path.join(dirpath, name)
+                with open(full, "rb") as f:
+                    yield os.path.relpath(full, path).replace(os.sep, "/"), f
+    else:
+        yield from iter_archive(path)
+
+
+def load_base(path):
+    """{archive path: sha256} of a previous release: a manifest file, an archive or a directory.
+
+    An archive's own manifests are trusted when present; anything they do
+    not cover is checksummed directly.
+    """
+    if path.endswith(".json"):
+        with open(path) as f:
+            manifest = json.load(f)
+        return {f"{manifest['package']}/{rel}": e["sha256"] for rel, e in manifest["files"].items()}
+    digests, manifests = {}, {}
+    for name, f in iter_base(path):
+        if os.path.basename(name) == MANIFEST:
+            manifests[os.path.dirname(name)] = json.load(f)
+        elif os.path.basename(name) != DELTA:
+            digests[name] = stream_digest(f)[0]
+    for package, manifest in manifests.items():
+        for rel, e in manifest["files"].items():
+            digests.setdefault(f"{package}/{rel}" if package else rel, e["sha256"])
+    return digests
+
+
+def apply_delta(base, delta, out):
+    """Rebuild full packages from `base` (archive or directory) and a `delta` archive.
+
+    `out` is a directory, or an archive when it ends in .tar.gz/.tgz/.zip.
+    Packages the delta does not mention are carried over from the base
+    unchanged. Raises ValueError when a file does not match its manifest,
+    i.e. the delta was made against a different base.
+    """
+    from premiere_kit.archive import PackageArchive
+
+    manifests, info = {}, None
+    for name, f in iter_archive(delta):
+        if name == DELTA:
+            info = json.load(f)
+        elif os.path.basename(name) == MANIFEST:
+            manifests[os.path.dirname(name)] = json.load(f)
+    if info is None:
+        raise ValueError(f"{delta} is not a delta package (no {DELTA})")
+    expected = {f"{pkg}/{rel}": e["sha256"] for pkg, m in manifests.items() for rel, e in m["files"].items()}
+    removed = set(info.get("removed", []))
+
+    archive = PackageArchive(out) if out.endswith((".tar.gz", ".tgz", ".zip")) else None
+    written = set()
+
+    def put(name, f):
+        sha = expected.get(name)
+        if archive:
+            archive.add_stream(name, f)
+            got = archive.digests[name][0]
+        else:
+            path = os.path.join(out, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as dst:
+                shutil.copyfileobj(f, dst)
+            with open(path, "rb") as check:
+                got = stream_digest(check)[0]
+        if sha is not None and got != sha:
+            raise ValueError(f"{name}: checksum mismatch (the delta was made against a different base)")
+        written.add(name)
+
+    try:
+        # closing(): a failed put() must not leave the archive being read open
+        with contextlib.closing(iter_archive(delta)) as members:
+            for name, f in members:
+                if name != DELTA:
+                    put(name, f)
+        with contextlib.closing(iter_base(base)) as members:
+            for name, f in members:
+                package = name.split("/", 1)[0]
+                if name in written or name in removed:
+                    continue
+                if package in manifests and name not in expected:
+                    continue  # dropped from the new manifest (or the old manifest itself)
+                put(name, f)
+        missing = sorted(set(expected) - written)
+        if missing:
+            raise ValueError(f"base is missing {len(missing)} file(s), e.g. {missing[0]}")
+    except BaseException:
+        if archive:
+            archive.abort()
+        raise
+    if archive:
+        archive.close()
+    return len(written)
@@ -0,0 +1,82 @@
+"""Remotion edit specs (edit_spec.json) as frame-timed section lists.
+
+An edit spec times its scenes in frames at its own rate:
+
+    {"project": "mochi-hired", "fps": 30, "scenes": [
+        {"id": "introducing", "start_frame": 0, "end_frame": 60,
+         "type": "text", "content": "Introducing", "animation": "fade_in"}, ...]}
+
+Each scene becomes a section that keeps its source span (`frames`) and
+`rate` next to the usual exact `dur`/`subs` seconds, so a Timeline at any
+rate rounds the original frame boundaries once (see premiere_kit.rates)
+instead of rounding seconds that were already rounded. Text scenes get
+their content as a subtitle over the whole scene; image scenes are pinned
+to the matching file under public/ for --conform. A scene with an "act"
+name starts that act, as in premiere_kit.cuts.
+"""
+
+import os
+from fractions import Fraction
+
+from premiere_kit.rates import parse_rate
+
+PUBLIC_DIR = "public"
+
+
+def is_edit_spec(data):
+    return isinstance(data, dict) and "scenes" in data
+
+
+def _public_files(public=PUBLIC_DIR):
+    """{path relative to public/: path} and {file name: first path with that name}, from one walk."""
+    by_path, by_name = {}, {}
+    for dirpath, dirnames, filenames in os.walk(public):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            by_path[os.path.relpath(path, public)] = path
+            by_name.setdefault(name, path)
+    return by_path, by_name
+
+
+def spec_sections(spec, public=PUBLIC_DIR):
+    """Sections for every scene of an edit spec, in timeline order. Raises ValueError.
+
+    Scenes must tile the cut from frame 0 without gaps or overlaps, as
+    the timeline has no place for either.
+    """
+    rate = parse_rate(spec.get("fps", 30))
+    num, den = Fraction(rate).numerator, Fraction(rate).denominator
+    scenes = sorted(spec["scenes"], key=lambda s: (s["start_frame"], s["end_frame"]))
+    files = None
+    sections = []
+    pos = 0
+    for scene in scenes:
+        sid, start, end = scene["id"], scene["start_frame"], scene["end_frame"]
+        if not (isinstance(start, int) and isinstance(end, int)) or end <= start:
+            raise ValueError(f"scene {sid!r}: frames {start}-{end} are not a forward range of whole frames")
+        if start != pos:
+            what = "a gap" if start > pos else "an overlap"
+            raise ValueError(f"scene {sid!r} starts at frame {start} but the previous scene ends at {pos} ({what})")
+        kind = scene.get("type", "scene")
+        content = scene.get("content", "")
+        dur = Fraction((end - start) * den, num)
+        section = {
+            "id": sid,
+            "label": f"{kind.upper()} — {content}" if content else kind.upper(),
+            "dur": dur,
+            "subs": [(0, dur, content)] if kind == "text" and content else [],
+            "frames": (start, end),
+            "rate": rate,
+        }
+        if scene.get("act"):
+            section["act"] = scene["act"]
+        if kind == "image" and content:
+            # Where Remotion's staticFile() finds it, else any file of that name under public/
+            by_path, by_name = files = files or _public_files(public)
+            media = by_path.get(os.path.normpath(content)) or by_name.get(os.path.basename(content))
+            if media is not None:
+                section["media"] = media
+        sections.append(section)
+        pos = end
+    return sections
@@ -0,0 +1,514 @@
+"""Single-pass export of a Timeline to several formats at once.
+
+`export()` walks the clips and their cues exactly once, in timeline order,
+and hands each one to every sink. Sinks stream what they can straight to
+their file. Formats that need the subtitle track after the picture track
+(xmeml, OTIO) spool it to a temporary file and append it at the end, so no
+format needs a second walk over the timeline.
+
+A sink is any object with `begin(timeline)`, `clip(clip)`, `cue(cue)`,
+`end()` and `summary()`. Adding a format means adding a sink here and an
+entry in SINKS.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from urllib.parse import quote
+
+from premiere_kit.build import digest
+from premiere_kit.intervals import allocate_tracks
+from premiere_kit.rates import timebase
+from premiere_kit.timeline import frames_to_srt
+from premiere_kit.xmeml import XmemlWriter
+
+SPOOL_MAX = 1 << 20  # spooled tracks stay in memory up to this size
+
+
+def export(timeline, sinks):
+    """Feed every clip and cue of `timeline` to each sink, in one pass."""
+    for sink in sinks:
+        sink.begin(timeline)
+    on_clip = [sink.clip for sink in sinks]
+    on_cue = [sink.cue for sink in sinks]
+    cues = timeline.cues
+    j = 0
+    for clip in timeline.clips:
+        for fn in on_clip:
+            fn(clip)
+        # Cues are stored grouped by the clip they belong to
+        while j < len(cues) and cues[j].clip is clip:
+            for fn in on_cue:
+                fn(cues[j])
+            j += 1
+    for sink in sinks:
+        sink.end()
+
+
+def _spool():
+    return tempfile.SpooledTemporaryFile(SPOOL_MAX, mode="w+", encoding="utf-8")
+
+
+def _copy_spool(spool, fh):
+    spool.seek(0)
+    shutil.copyfileobj(spool, fh)
+    spool.close()
+
+
+class Sink:
+    def __init__(self, fh):
+        self.fh = fh
+        self.clips = 0
+        self.cues = 0
+
+    def begin(self, timeline):
+        self.timeline = timeline
+
+    def clip(self, clip):
+        self.clips += 1
+
+    def cue(self, cue):
+        self.cues += 1
+
+    def end(self):
+        pass
+
+    def summary(self):
+        return f"{self.cues} subtitles"
+
+
+class SrtSink(Sink):
+    def cue(self, cue):
+        fps = self.timeline.fps
+        sep = "\n" if self.cues else ""
+        self.fh.write(f"{sep}{cue.index}\n{frames_to_srt(cue.start, fps)} --> {frames_to_srt(cue.end, fps)}\n{cue.text}\n")
+        self.cues += 1
+
+
+class VttSink(Sink):
+    def begin(self, timeline):
+        super().begin(timeline)
+        self.fh.write("WEBVTT\n")
+
+    def cue(self, cue):
+        fps = self.timeline.fps
+        start = frames_to_srt(cue.start, fps).replace(",", ".")
+        end = frames_to_srt(cue.end, fps).replace(",", ".")
+        self.fh.write(f"\n{cue.index}\n{start} --> {end}\n{cue.text}\n")
+        self.cues += 1
+
+
+def timecode(frame, fps):
+    """Non-drop-frame SMPTE timecode for an integer timebase (30 for 29.97)."""
+    ff = frame % fps
+    s = frame // fps
+    return f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}:{ff:02d}"
+
+
+class EdlSink(Sink):
+    """CMX3600 EDL of the picture track. CMX3600 has no subtitle events, so cues are not written."""
+
+    def __init__(self, fh, title, media_ext="mp4"):
+        super().__init__(fh)
+        self.title = title
+        self.media_ext = media_ext
+
+    def begin(self, timeline):
+        super().begin(timeline)
+        self.fh.write(f"TITLE: {self.title}\nFCM: NON-DROP FRAME\n")
+
+    def clip(self, clip):
+        self.clips += 1
+        fps = timebase(self.timeline.fps)[0]
+        src = f"{timecode(0, fps)} {timecode(clip.dur, fps)}"
+        rec = f"{timecode(clip.start, fps)} {timecode(clip.end, fps)}"
+        self.fh.write(f"\n{self.clips:03d}  AX       V     C        {src} {rec}\n"
+                      f"* FROM CLIP NAME: {clip.id}.{self.media_ext}\n"
+                      f"* COMMENT: {clip.label}\n")
+
+    def cue(self, cue):
+        pass
+
+    def summary(self):
+        return f"{self.clips} events"
+
+
+def _rational(value, rate):
+    return {"OTIO_SCHEMA": "RationalTime.1", "rate": float(rate), "value": float(value)}
+
+
+def _range(start, dur, rate):
+    return {"OTIO_SCHEMA": "TimeRange.1", "start_time": _rational(start, rate), "duration": _rational(dur, rate)}
+
+
+def _item(schema, name, dur, rate, **fields):
+    return {"OTIO_SCHEMA": schema, "name": name, "metadata": fields.pop("metadata", {}),
+            "source_range": _range(0, dur, rate), "effects": [], "markers": [], **fields}
+
+
+def _track_head(name, kind):
+    return (f'{{"OTIO_SCHEMA": "Track.1", "name": {json.dumps(name)}, "kind": "{kind}", '
+            f'"metadata": {{}}, "source_range": null, "effects": [], "markers": [], "children": [')
+
+
+class OtioSink(Sink):
+    """OpenTimelineIO JSON: the picture track, plus text tracks for subtitles.
+
+    OTIO tracks are strictly sequential, so a cue that starts before the
+    previous one on a track ended goes to the next track with room for it.
+    """
+
+    def __init__(self, fh, name, media_ext="mp4"):
+        super().__init__(fh)
+        self.name = name
+        self.media_ext = media_ext
+        self.tracks = []  # [spool, end frame, item count] per subtitle track
+
+    def begin(self, timeline):
+        super().begin(timeline)
+        self.rate = timeline.fps
+        self.fh.write(f'{{"OTIO_SCHEMA": "Timeline.1", "name": {json.dumps(self.name)}, "metadata": {{}}, '
+                      f'"global_start_time": null, "tracks": {{"OTIO_SCHEMA": "Stack.1", "name": "tracks", '
+                      f'"metadata": {{}}, "source_range": null, "effects": [], "markers": [], "children": [\n')
+        self.fh.write(_track_head("V1", "Video"))
+
+    def _child(self, fh, first, item):
+        fh.write(("\n" if first else ",\n") + json.dumps(item, ensure_ascii=False))
+
+    def clip(self, clip):
+        item = _item("Clip.1", clip.label, clip.dur, self.rate, metadata={"section_id": clip.id},
+                     media_reference={"OTIO_SCHEMA": "ExternalReference.1", "name": "", "metadata": {},
+                                      "available_range": None,
+                                      "target_url": f"placeholders/{clip.id}.{self.media_ext}"})
+        self._child(self.fh, not self.clips, item)
+        self.clips += 1
+
+    def cue(self, cue):
+        track = next((t for t in self.tracks if t[1] <= cue.start), None)
+        if track is None:
+            track = [_spool(), 0, 0]
+            self.tracks.append(track)
+        spool, pos, count = track
+        if cue.start > pos:
+            self._child(spool, not count, _item("Gap.1", "", cue.start - pos, self.rate))
+            count += 1
+        item = _item("Clip.1", cue.text[:50], cue.dur, self.rate,
+                     media_reference={"OTIO_SCHEMA": "GeneratorReference.1", "name": "", "metadata": {},
+                                      "available_range": None, "generator_kind": "Text",
+                                      "parameters": {"text": cue.text}})
+        self._child(spool, not count, item)
+        track[1:] = [cue.end, count + 1]
+        self.cues += 1
+
+    def end(self):
+        self.fh.write("\n]}")
+        for i, (spool, _, _) in enumerate(self.tracks):
+            self.fh.write(",\n" + _track_head(f"T{i + 1}", "Video"))
+            _copy_spool(spool, self.fh)
+            self.fh.write("\n]}")
+        self.fh.write("\n]}}\n")
+
+
+class XmemlSink(Sink):
+    """FCP xmeml: V1 placeholder clips with file references, text generators on V2 and up.
+
+    `media_ext=None` references no placeholder files at all (the
+    generate-prproj-xml.py document).
+    """
+
+    def __init__(self, fh, rate, project, sequence, media_ext="mp4", width=1920, height=1080, media=None):
+        super().__init__(fh)
+        self.timebase, self.ntsc = timebase(rate)
+        self.project = project
+        self.sequence = sequence
+        self.media_ext = media_ext
+        self.width = width
+        self.height = height
+        self.media = media or {}  # clip id -> conformed Media
+        self.conformed = 0
+
+    def begin(self, timeline):
+        super().begin(timeline)
+        w = self.w = XmemlWriter(self.fh)
+        w.declaration()
+        w.open("xmeml", version="5")
+        w.open("project")
+        w.leaf("name", self.project)
+        w.open("children")
+        self.tracks, count = timeline.cue_tracks
+        self.subs = self._open_sequence(w, self.sequence, timeline.frames, count)
+
+    def _open_sequence(self, w, name, duration, tracks, **attrs):
+        """Open a sequence down to its V1 track; returns writers for its subtitle tracks.
+
+        Subtitle tracks follow V1 in the document; they are written aside at
+        the same depth. Overlapping cues are stacked on as few extra tracks
+        as possible.
+        """
+        w.open("sequence", **attrs)
+        w.leaf("name", name)
+        w.leaf("duration", duration)
+        w.rate(self.timebase, self.ntsc)
+        w.open("media")
+        w.open("video")
+        w.open("track")
+        subs = []
+        for _ in range(max(tracks, 1)):
+            sub = XmemlWriter(_spool())
+            sub.stack = w.stack[:-1]
+            sub.open("track")
+            sub.leaf("enabled", "TRUE")
+            sub.leaf("locked", "FALSE")
+            subs.append(sub)
+        return subs
+
+    def _close_sequence(self, w, subs):
+        w.close()  # V1
+        for sub in subs:
+            sub.close()
+            _copy_spool(sub.fh, w.fh)
+        for _ in range(3):  # video, media, sequence
+            w.close()
+
+    def clip(self, clip):
+        self._clipitem(self.w, clip, f"clip-{clip.index + 1}", f"file-{clip.index + 1}")
+        self.clips += 1
+
+    def _clipitem(self, w, clip, item_id, file_id, offset=0):
+        """One V1 clipitem; `offset` is subtracted from its timeline frames."""
+        tb, ntsc, ext = self.timebase, self.ntsc, self.media_ext
+        with w.element("clipitem", id=item_id):
+            w.leaf("name", clip.label)
+            w.leaf("duration", clip.dur)
+            w.rate(tb, ntsc)
+            w.leaf("start", clip.start - offset)
+            w.leaf("end", clip.end - offset)
+            w.leaf("in", 0)
+            w.leaf("out", clip.dur)
+
+            media = self.media.get(clip.id)
+            if media is not None:
+                self._conformed_file(w, media, file_id)
+            elif ext is None:
+                # No placeholder files: a black video generator the size of the sequence
+                with w.element("file", id=file_id):
+                    w.leaf("name", clip.label)
+                    w.leaf("duration", clip.dur)
+                    w.rate(tb, ntsc)
+                    with w.element("media"), w.element("video"), w.element("samplecharacteristics"):
+                        w.leaf("width", self.width)
+                        w.leaf("height", self.height)
+            else:
+                # File reference — points to placeholder MP4/PNG
+                with w.element("file", id=file_id):
+                    w.leaf("name", f"{clip.id}.{ext}")
+                    if ext != "png":
+                        w.leaf("duration", clip.dur)
+                    w.rate(tb, ntsc)
+                    # pathurl — relative path to placeholder
+                    w.leaf("pathurl", f"placeholders/{clip.id}.{ext}")
+                    with w.element("media"), w.element("video"), w.element("samplecharacteristics"):
+                        w.leaf("width", self.width)
+                        w.leaf("height", self.height)
+
+            # Marker with section info
+            with w.element("marker"):
+                w.leaf("name", clip.id)
+                w.leaf("comment", clip.label)
+                w.leaf("in", 0)
+                w.leaf("out", -1)
+
+    def _conformed_file(self, w, media, file_id):
+        """File reference to real media, with its own rate, length and size."""
+        rate = media.rate
+        with w.element("file", id=file_id):
+            w.leaf("name", os.path.basename(media.path))
+            if rate is not None and media.duration is not None:
+                w.leaf("duration", round(media.duration * rate))
+            if rate is not None:
+                w.rate(*timebase(rate))
+            else:
+                w.rate(self.timebase, self.ntsc)
+            w.leaf("pathurl", "file://localhost" + quote(os.path.abspath(media.path).replace(os.sep, "/")))
+            with w.element("media"), w.element("video"), w.element("samplecharacteristics"):
+                w.leaf("width", media.width or self.width)
+                w.leaf("height", media.height or self.height)
+        self.conformed += 1
+
+    def cue(self, cue):
+        self._generatoritem(self.subs[self.tracks[cue.index - 1]], cue, f"sub-{cue.index}")
+        self.cues += 1
+
+    def _generatoritem(self, w, cue, item_id, offset=0):
+        with w.element("generatoritem", id=item_id):
+            w.leaf("name", cue.text[:50])
+            w.leaf("duration", cue.dur)
+            w.rate(self.timebase, self.ntsc)
+            w.leaf("start", cue.start - offset)
+            w.leaf("end", cue.end - offset)
+            w.leaf("in", 0)
+            w.leaf("out", cue.dur)
+
+            with w.element("effect"):
+                w.leaf("name", "Text")
+                w.leaf("effectid", "Text")
+                w.leaf("effectcategory", "Text")
+                w.leaf("effecttype", "generator")
+                w.leaf("mediatype", "video")
+                for param_id, name, value in (("str", "Text", cue.text), ("font", "Font", "SF Pro"),
+                                              ("fontsize", "Font Size", "42")):
+                    with w.element("parameter"):
+                        w.leaf("parameterid", param_id)
+                        w.leaf("name", name)
+                        w.leaf("value", value)
+
+    def end(self):
+        self._close_sequence(self.w, self.subs)
+        while self.w.stack:
+            self.w.close()
+
+    def summary(self):
+        tracks = len(self.subs)
+        stacked = f", {tracks} subtitle tracks" if tracks > 1 else ""
+        conformed = f", {self.conformed} conformed to real media" if self.conformed else ""
+        return f"{self.clips} clips, {self.timeline.frames} frames{stacked}{conformed}"
+
+
+def act_id(act, rate, width=1920, height=1080, media_ext="mp4", media=None):
+    """Stable id of an act's sequence: its name plus a hash of everything in it, relative to its start."""
+    media = media or {}
+    clips = ((c.id, c.label, c.start - act.start, c.end - act.start, media.get(c.id)) for c in act.clips)
+    cues = ((c.start - act.start, c.end - act.start, c.text) for c in act.cues)
+    key = digest("act", act.name, rate, width, height, media_ext, clips, cues)
+    slug = "-".join(re.findall(r"[a-z0-9]+", act.name.lower())) or "act"
+    return f"act-{slug}-{key[:10]}"
+
+
+class XmemlActsSink(XmemlSink):
+    """xmeml with every act as its own sequence, nested in a master sequence of one clip per act.
+
+    Act sequences come first, as project items, with frames relative to the
+    act start, their own subtitle tracks and ids scoped to the act. The
+    master sequence only references them by id, so it stays as small as
+    the number of acts. Act ids come from act_id(): an act that did not
+    change keeps its id across regenerations however the acts around it
+    moved, and identical acts are defined once.
+
+    With `split`, every act goes to a document of its own instead, opened
+    by `split(act id)` (which returns a file object, or None to skip the
+    act) and closed as soon as the act is written, and no master is written.
+    """
+
+    def __init__(self, fh, rate, project, sequence, media_ext="mp4", width=1920, height=1080, media=None,
+                 split=None):
+        super().__init__(fh, rate, project, sequence, media_ext, width, height, media)
+        self.rate = rate
+        self.split = split
+        self.written = 0
+
+    def begin(self, timeline):
+        Sink.begin(self, timeline)
+        self.acts = timeline.acts
+        self.ids = [act_id(act, self.rate, self.width, self.height, self.media_ext, self.media) for act in self.acts]
+        self.act = None
+        self.w = self.doc = None
+        if self.split is None:
+            self.doc = self._open_document(self.fh)
+        self.defined = set()
+
+    def _open_document(self, fh):
+        w = XmemlWriter(fh)
+        w.declaration()
+        w.open("xmeml", version="5")
+        w.open("project")
+        w.leaf("name", self.project)
+        w.open("children")
+        return w
+
+    def _open_act(self, act):
+        aid = self.ids[act.index]
+        self.act = act
+        self.w = None
+        if self.split is not None:
+            fh = self.split(aid)
+            if fh is None:
+                return
+            self.w = self._open_document(fh)
+        elif aid not in self.defined:
+            self.w = self.doc
+        else:
+            return
+        self.defined.add(aid)
+        tracks, count = allocate_tracks([(c.start, c.end) for c in act.cues])
+        self.tracks = {cue.index: track for cue, track in zip(act.cues, tracks)}
+        self.subs = self._open_sequence(self.w, act.name, act.dur, count, id=aid)
+        self.written += 1
+
+    def _close_act(self):
+        if self.w is None:
+            return
+        self._close_sequence(self.w, self.subs)
+        if self.split is not None:
+            while self.w.stack:
+                self.w.close()
+            self.w.fh.close()
+        self.w = None
+
+    def clip(self, clip):
+        i = self.act.index + 1 if self.act else 0
+        if i < len(self.acts) and clip is self.acts[i].clips[0]:
+            self._close_act()
+            self._open_act(self.acts[i])
+        if self.w is not None:
+            n = clip.index - self.act.clips[0].index + 1
+            aid = self.ids[self.act.index]
+            self._clipitem(self.w, clip, f"{aid}-clip-{n}", f"{aid}-file-{n}", self.act.start)
+        self.clips += 1
+
+    def cue(self, cue):
+        if self.w is not None:
+            n = cue.index - self.act.cues[0].index + 1
+            aid = self.ids[self.act.index]
+            self._generatoritem(self.subs[self.tracks[cue.index]], cue, f"{aid}-sub-{n}", self.act.start)
+        self.cues += 1
+
+    def end(self):
+        self._close_act()
+        w = self.doc
+        if w is None:
+            return
+        # Master: one clip per act, each referencing the act's sequence by id
+        w.open("sequence")
+        w.leaf("name", self.sequence)
+        w.leaf("duration", self.timeline.frames)
+        w.rate(self.timebase, self.ntsc)
+        with w.element("media"), w.element("video"), w.element("track"):
+            for act, aid in zip(self.acts, self.ids):
+                with w.element("clipitem", id=f"master-{act.index + 1}"):
+                    w.leaf("name", act.name)
+                    w.leaf("duration", act.dur)
+                    w.rate(self.timebase, self.ntsc)
+                    w.leaf("start", act.start)
+                    w.leaf("end", act.end)
+                    w.leaf("in", 0)
+                    w.leaf("out", act.dur)
+                    w.leaf("sequence", id=aid)
+        while w.stack:
+            w.close()
+
+    def summary(self):
+        conformed = f", {self.conformed} conformed to real media" if self.conformed else ""
+        if self.split is not None:
+            return f"{self.written} of {len(self.acts)} acts written{conformed}"
+        return f"{len(self.acts)} acts nested in the master, {self.clips} clips, {self.timeline.frames} frames{conformed}"
+
+
+SINKS = {
+    "srt": SrtSink,
+    "vtt": VttSink,
+    "edl": EdlSink,
+    "otio": OtioSink,
+    "xml": XmemlSink,
+}
@@ -0,0 +1,187 @@
+"""Asyncio runner for ffmpeg jobs.
+
+Every job runs with `-progress pipe:1`. Its progress is parsed as it
+arrives and folded into one aggregate status line, and only the tail of
+stderr is kept, so a chatty encode cannot grow memory. Each attempt has a
+timeout. Transient failures (timeouts, signals, resource exhaustion) are
+retried with backoff. When the run is cancelled (Ctrl-C), every in-flight
+ffmpeg is killed and its partial outputs are removed before the
+cancellation propagates.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+
+STDERR_TAIL = 10
+TRANSIENT = (
+    "Resource temporarily unavailable",
+    "Cannot allocate memory",
+    "Too many open files",
+    "Device or resource busy",
+)
+
+
+class Job:
+    """One ffmpeg invocation: `args` without -progress, the files it writes, and its frame count."""
+
+    def __init__(self, name, args, outputs, frames=0):
+        self.name = name
+        self.args = args
+        self.outputs = outputs
+        self.frames = frames
+        self.frame = 0
+        self.returncode = None
+        self.stderr_tail = deque(maxlen=STDERR_TAIL)
+        self.timed_out = False
+        self.attempts = 0
+        self.wall_s = 0.0
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+    @property
+    def stderr(self):
+        return "\n".join(self.stderr_tail)
+
+    def error(self):
+        if self.timed_out:
+            return f"ffmpeg timed out on {self.name} after {self.attempts} attempt(s):\n{self.stderr}"
+        return f"ffmpeg failed on {self.name} (exit {self.returncode}):\n{self.stderr}"
+
+    def transient(self):
+        return (self.timed_out or (self.returncode or 0) < 0
+                or any(marker in line for line in self.stderr_tail for marker in TRANSIENT))
+
+
+class Progress:
+    """Aggregate status line over all jobs, redrawn on stderr when it is a terminal."""
+
+    def __init__(self, jobs, stream=sys.stderr, interval=0.1):
+        self.jobs = jobs
+        self.stream = stream
+        self.enabled = stream.isatty()
+        self.interval = interval
+        self.total = sum(j.frames for j in jobs) or 1
+        self.running = 0
+        self.done = 0
+        self.last = 0.0
+
+    def update(self, force=False):
+        now = time.monotonic()
+        if not self.enabled or (not force and now - self.last < self.interval):
+            return
+        self.last = now
+        frames = sum(min(j.frame, j.frames) for j in self.jobs)
+        self.stream.write(f"\r\033[K  encoding {self.done}/{len(self.jobs)} done · {self.running} running · "
+                          f"{frames * 100 // self.total}% ({frames}/{self.total} frames)")
+        self.stream.flush()
+
+    def clear(self):
+        if self.enabled:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+
+
+def _remove(paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+async def _read_progress(stream, job, progress):
+    async for line in stream:
+        key, _, value = line.decode(errors="replace").strip().partition("=")
+        if key == "frame" and value.isdigit():
+            job.frame = int(value)
+            progress.update()
+
+
+async def _read_stderr(stream, job):
+    async for line in stream:
+        job.stderr_tail.append(line.decode(errors="replace").rstrip())
+
+
+async def _attempt(job, timeout, progress):
+    job.attempts += 1
+    job.frame = 0
+    job.timed_out = False
+    job.stderr_tail.clear()
+    proc = await asyncio.create_subprocess_exec(
+        job.args[0], "-nostats", "-progress", "pipe:1", *job.args[1:],
+        stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    reads = asyncio.gather(_read_progress(proc.stdout, job, progress), _read_stderr(proc.stderr, job), proc.wait())
+    try:
+        await asyncio.wait_for(reads, timeout)
+    except asyncio.TimeoutError:
+        job.timed_out = True
+    finally:
+        # Reached on timeout and on cancellation alike: never leave an orphaned ffmpeg
+        if proc.returncode is None:
+            proc.kill()
+            await asyncio.shield(proc.wait())
+        if reads.done() and not reads.cancelled():
+            reads.exception()  # retrieved here; a cancellation propagates on its own
+    job.returncode = proc.returncode
+
+
+async def _run(job, slots, timeout, retries, backoff, progress):
+    async with slots:
+        progress.running += 1
+        start = time.perf_counter()
+        try:
+            for attempt in range(retries + 1):
+                await _attempt(job, timeout, progress)
+                if job.ok or not job.transient() or attempt == retries:
+                    break
+                await asyncio.sleep(backoff * 2 ** attempt)
+        except asyncio.CancelledError:
+            _remove(job.outputs)
+            raise
+        finally:
+            job.wall_s = time.perf_counter() - start
+            progress.running -= 1
+        if not job.ok:
+            _remove(job.outputs)
+        progress.done += 1
+        progress.update(force=True)
+        return job
+
+
+async def run_jobs_async(jobs, concurrency=None, timeout=None, retries=1, backoff=0.5,
+                         fail_fast=True, on_done=None):
+    progress = Progress(jobs)
+    slots = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+    tasks = [asyncio.create_task(_run(job, slots, timeout, retries, backoff, progress)) for job in jobs]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            job = await next_done
+            if on_done is not None:
+                # Callbacks may print; keep their lines clear of the status line
+                progress.clear()
+                on_done(job)
+                progress.update(force=True)
+            if fail_fast and not job.ok:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        progress.clear()
+    return jobs
+
+
+def run_jobs(jobs, concurrency=None, timeout=None, retries=1, backoff=0.5, fail_fast=True, on_done=None):
+    """Run ffmpeg `jobs` with at most `concurrency` at once; returns them with results filled in.
+
+    `timeout` bounds each attempt in seconds; transient failures are retried
+    up to `retries` times. With `fail_fast`, the first job that still fails
+    cancels the rest (their returncode stays None). `on_done(job)` is called
+    as each job finishes. Ctrl-C kills every running ffmpeg, removes its
+    outputs and raises KeyboardInterrupt.
+    """
+    return asyncio.run(run_jobs_async(jobs, concurrency, timeout, retries, backoff, fail_fast, on_done))
@@ -0,0 +1,89 @@
+"""Interval checks and track allocation for subtitle cues.
+
+Both work on one start-sorted sweep, so they stay O(n log n) on caption
+sets with tens of thousands of cues:
+
+- `allocate_tracks()` packs intervals onto the fewest parallel tracks
+  (interval partitioning). A min-heap of busy tracks ordered by end frame
+  frees tracks as cues end, and the lowest free track is reused first, so
+  nothing moves off track 0 unless it has to.
+- `check_cues()` reports cues that overlap another, cues that run past
+  the end of their section, and stretches with no subtitle on screen.
+"""
+
+import heapq
+
+
+def allocate_tracks(intervals):
+    """Track number for each (start, end), in input order, and the number of tracks used."""
+    order = sorted(range(len(intervals)), key=lambda i: intervals[i])
+    tracks = [0] * len(intervals)
+    busy = []  # (end, track)
+    free = []  # track numbers, lowest first
+    count = 0
+    for i in order:
+        start, end = intervals[i]
+        while busy and busy[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if free:
+            track = heapq.heappop(free)
+        else:
+            track = count
+            count += 1
+        tracks[i] = track
+        heapq.heappush(busy, (end, track))
+    return tracks, count
+
+
+class CueReport:
+    __slots__ = ("overlaps", "overruns", "gaps")
+
+    def __init__(self):
+        self.overlaps = []  # (earlier cue still on screen, cue that starts over it)
+        self.overruns = []  # cues ending after their section
+        self.gaps = []      # (start frame, end frame) with no subtitle
+
+    def __bool__(self):
+        return bool(self.overlaps or self.overruns)
+
+
+def check_cues(timeline):
+    report = CueReport()
+    latest = None  # cue reaching furthest right so far
+    for cue in sorted(timeline.cues, key=lambda c: (c.start, c.end)):
+        covered = latest.end if latest else 0
+        if cue.start < covered:
+            report.overlaps.append((latest, cue))
+        elif cue.start > covered:
+            report.gaps.append((covered, cue.start))
+        if cue.end > cue.clip.end:
+            report.overruns.append(cue)
+        if latest is None or cue.end > latest.end:
+            latest = cue
+    covered = latest.end if latest else 0
+    if covered < timeline.frames:
+        report.gaps.append((covered, timeline.frames))
+    return report
+
+
+def cue_warnings(timeline, tracks=None):
+    """(is_problem, line) pairs describing check_cues(), as the generators print them.
+
+    Overlaps and overruns are problems; stacked tracks and stretches
+    without subtitles are for information.
+    """
+    fps = float(timeline.fps)
+    report = check_cues(timeline)
+    for a, b in report.overlaps:
+        yield True, (f"cue {b.index} ({b.clip.id}) overlaps cue {a.index} ({a.clip.id}) "
+                     f"for {(min(a.end, b.end) - b.start) / fps:g}s: {b.text!r}")
+    if tracks and tracks > 1:
+        yield False, f"overlapping cues stacked on {tracks} subtitle tracks"
+    for cue in report.overruns:
+        yield True, (f"cue {cue.index} runs {(cue.end - cue.clip.end) / fps:g}s past the end of {cue.clip.id}: "
+                     f"{cue.text!r}")
+    if report.gaps:
+        longest = max(report.gaps, key=lambda g: g[1] - g[0])
+        total = sum(end - start for start, end in report.gaps)
+        yield False, (f"{len(report.gaps)} stretches without subtitles ({total / fps:g}s in total, longest "
+                      f"{(longest[1] - longest[0]) / fps:g}s at {longest[0] / fps:g}s)")
@@ -0,0 +1,197 @@
+"""Index of real media under the project's media roots, for conforming.
+
+`MediaIndex.scan()` walks the roots once and keeps ffprobe metadata
+(duration, size, frame rate) in a SQLite file keyed by path. A file is
+probed again only when its mtime or size changed, and rows for files that
+disappeared are dropped, so rescans of an unchanged tree run no ffprobe at
+all. Without ffprobe, PNG sizes are read from the header and other files
+are indexed without metadata for that scan only: nothing is stored, so
+they are probed properly once ffprobe is installed.
+
+`match()` finds the media for a section id by naming convention: a file
+named after the full id (`03-anthony.mp4`) wins over one named after the
+id without its leading number (`anthony.mp4`; ids without one, like
+`theo-work`, only match in full). `-v2`-style suffixes are versions of
+the same name; the highest version wins, then video over stills, then the
+newest file.
+"""
+
+import json
+import os
+import re
+import shutil
+import sqlite3
+import struct
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+
+MEDIA_ROOTS = ("project/ai-selves/Images", "premiere/assets", "public")
+VIDEO_EXTS = (".mp4", ".mov", ".m4v", ".webm", ".mkv")
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+VERSION = re.compile(r"^(.*?)[-_]v(\d+)$")
+
+
+class Media(namedtuple("Media", "path mtime_ns size duration width height fps")):
+    """One indexed file; `fps` is ffprobe's "num/den" text, None for stills."""
+    __slots__ = ()
+
+    @property
+    def is_video(self):
+        return self.path.lower().endswith(VIDEO_EXTS)
+
+    @property
+    def rate(self):
+        return Fraction(self.fps) if self.fps else None
+
+
+def _png_size(path):
+    with open(path, "rb") as f:
+        head = f.read(24)
+    if head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        return None, None
+    return struct.unpack(">II", head[16:24])
+
+
+def probe(path, ffprobe="ffprobe", timeout=None):
+    """(duration s or None, width, height, fps as "num/den" or None) of one file.
+
+    None when ffprobe runs past `timeout` seconds (a hung network mount):
+    the file is unprobed, not a file without metadata.
+    """
+    if ffprobe is None:
+        width, height = _png_size(path) if path.lower().endswith(".png") else (None, None)
+        return None, width, height, None
+    try:
+        out = subprocess.run(
+            [ffprobe, "-v", "error", "-select_streams", "v:0", "-show_entries",
+             "stream=width,height,r_frame_rate:format=duration", "-of", "json", path],
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return None
+    if out.returncode != 0:
+        return None, None, None, None
+    info = json.loads(out.stdout or "{}")
+    stream = (info.get("streams") or [{}])[0]
+    video = path.lower().endswith(VIDEO_EXTS)
+    duration = info.get("format", {}).get("duration")
+    rate = stream.get("r_frame_rate")
+    return (float(duration) if video and duration not in (None, "N/A") else None,
+            stream.get("width"), stream.get("height"),
+            rate if video and rate not in (None, "0/0") else None)
+
+
+def _names(path):
+    """(name, version) a media file answers to: lowercase stem with any -vN suffix split off."""
+    stem = os.path.splitext(os.path.basename(path))[0].lower()
+    m = VERSION.match(stem)
+    return (m.group(1), int(m.group(2))) if m else (stem, 1)
+
+
+class MediaIndex:
+    def __init__(self, db_path):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS media (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+                        "duration REAL, width INTEGER, height INTEGER, fps TEXT)")
+        self.by_name = {}
+        self.probed = 0
+        self.cached = 0
+        self.removed = 0
+        self.timed_out = []
+        self.timeout = None
+
+    def scan(self, roots=MEDIA_ROOTS, jobs=None, timeout=None, retries=1):
+        """Index every media file under `roots`, probing only new or changed files.
+
+        Each ffprobe gets `timeout` seconds and `retries` more tries. Files it
+        still hangs on are left out of this scan (their sections stay
+        placeholders) and are not stored, so the next scan probes them again.
+        """
+        self.timeout = timeout
+        known = {row[0]: Media(*row) for row in self.db.execute("SELECT * FROM media")}
+        found, stale = [], []
+        for root in roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for name in sorted(filenames):
+                    if name.startswith(".") or not name.lower().endswith(VIDEO_EXTS + IMAGE_EXTS):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    st = os.stat(path)
+                    row = known.get(path)
+                    if row is not None and (row.mtime_ns, row.size) == (st.st_mtime_ns, st.st_size):
+                        found.append(row)
+                    else:
+                        stale.append((path, st))
+
+        ffprobe = shutil.which("ffprobe")
+
+        def probe_with_retries(path):
+            for _ in range(retries + 1):
+                meta = probe(path, ffprobe, timeout)
+                if meta is not None:
+                    return meta
+            return None
+
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+            probes = list(pool.map(lambda item: probe_with_retries(item[0]), stale))
+        self.timed_out = [path for (path, _), meta in zip(stale, probes) if meta is None]
+        fresh = [Media(path, st.st_mtime_ns, st.st_size, *meta) for (path, st), meta in zip(stale, probes)
+                 if meta is not None]
+        if ffprobe:
+            # Rows from header reads alone would be reused as long as the files stay the same
+            self.db.executemany("INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?)", fresh)
+
+        # Forget files that are gone from the roots that were scanned
+        seen = {m.path for m in found} | {m.path for m in fresh} | set(self.timed_out)
+        prefixes = tuple(os.path.join(root, "") for root in roots)
+        gone = [(p,) for p in known if p.startswith(prefixes) and p not in seen]
+        self.db.executemany("DELETE FROM media WHERE path = ?", gone)
+        self.db.commit()
+
+        self.probed, self.cached, self.removed = len(fresh), len(found), len(gone)
+        self.by_name = {}
+        for media in found + fresh:
+            name, version = _names(media.path)
+            self.by_name.setdefault(name, []).append((version, media.is_video, media.mtime_ns, media))
+        return self
+
+    def match(self, section_id):
+        """The media for a section, or None."""
+        section_id = section_id.lower()
+        for name in (section_id, re.sub(r"^\d+-", "", section_id)):
+            candidates = self.by_name.get(name)
+            if candidates:
+                return max(candidates, key=lambda c: c[:3])[3]
+        return None
+
+    def conform(self, clips):
+        """{clip id: Media} for every clip with matching media.
+
+        A section's own `"media": "path"` entry pins it to that file.
+        """
+        matched = {}
+        for clip in clips:
+            pinned = clip.section.get("media")
+            if pinned:
+                media = next((c[3] for c in self.by_name.get(_names(pinned)[0], ()) if c[3].path == pinned), None)
+                if media is None and os.path.exists(pinned):
+                    st = os.stat(pinned)
+                    meta = probe(pinned, shutil.which("ffprobe"), self.timeout)
+                    media = Media(pinned, st.st_mtime_ns, st.st_size, *meta) if meta is not None else None
+            else:
+                media = self.match(clip.id)
+            if media is not None:
+                matched[clip.id] = media
+        return matched
+
+    def stats(self):
+        timed_out = f", {len(self.timed_out)} timed out" if self.timed_out else ""
+        return (f"{self.cached + self.probed} files ({self.probed} probed, {self.cached} cached, "
+                f"{self.removed} gone{timed_out})")
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,834 @@
+"""In-process API for building Premiere packages.
+
+Everything gen-premiere-package.py does is here, importable and without
+side effects at import time, so a long-running process can build any
+number of cuts without starting Python (or re-reading the sections) for
+each one:
+
+    from premiere_kit.cuts import CUTS
+    from premiere_kit.package import build_packages
+
+    build_packages([CUTS["v2"]], formats=("srt", "xml", "otio"))
+
+`build_packages()` builds several cuts with one shared encode pool, and
+the per-emitter functions (`stream_export()`, `render_export()`,
+`write_exports()`, `generate_placeholders()`, `generate_animatic()`, ...)
+can be used on their own. Progress goes to stdout, or to the text stream
+passed as out=; pass quiet=True to silence it. Failed encodes raise
+RuntimeError.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from premiere_kit.archive import PackageArchive
+from premiere_kit.build import BuildGraph, digest, file_digest
+from premiere_kit.cuts import Cut
+from premiere_kit.delta import DELTA, MANIFEST, dir_digests, load_base, manifest_json
+from premiere_kit.export import SINKS, EdlSink, OtioSink, SrtSink, XmemlActsSink, XmemlSink, act_id, export
+from premiere_kit.ffmpeg import Job, run_jobs
+from premiere_kit.intervals import cue_warnings
+from premiere_kit.media import MEDIA_ROOTS, MediaIndex
+from premiere_kit.png import write_card
+from premiere_kit.profile import MeteredFile, Profiler
+from premiere_kit.rates import rate_label
+from premiere_kit.storyboard import THUMB_DIR, Frame, generate_storyboard
+from premiere_kit.targets import DEFAULT as DEFAULT_TARGET
+from premiere_kit.timeline import Timeline
+
+UNTITLED = ("AI Selves Leti", "AI Selves Leti")  # (project, sequence) of exports made without a Cut
+CACHE_DIR = ".cache/placeholders"
+CACHE_MAX_MB = 1024
+
+
+PLACEHOLDER_ENCODE = ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "ultrafast"]
+
+
+def placeholder_label(clip):
+    return clip.id.split("-", 1)[-1].replace("-", " ").upper()
+
+
+def placeholder_drawtext(clip):
+    return f"drawtext=text='{placeholder_label(clip)}':fontcolor=white:fontsize=48:x=(w-text_w)/2:y=(h-text_h)/2:font=monospace"
+
+
+def placeholder_args(clip, target=DEFAULT_TARGET):
+    """ffmpeg arguments (minus the output path) that fully determine a placeholder's pixels.
+
+    `clip` must come from a timeline at `target.fps`.
+    """
+    return [
+        "ffmpeg", "-y", "-f", "lavfi",
+        "-i", f"color=c=0x111111:s={target.size}:r={target.fps}",
+        "-vf", placeholder_drawtext(clip),
+        "-frames:v", str(clip.dur),
+    ] + PLACEHOLDER_ENCODE
+
+
+def placeholder_key(args):
+    """Content address for a placeholder: hash of every encode argument."""
+    return hashlib.sha256("\0".join(args).encode()).hexdigest()
+
+
+def placeholder_graph_args(clips, outfiles, target=DEFAULT_TARGET):
+    """ffmpeg arguments that encode several placeholders from a single process.
+
+    One color source is split into a branch per section; each branch is
+    trimmed to the section's frame count, gets its own drawtext and is
+    mapped to its own output file. ffmpeg startup, graph setup, font
+    loading and x264 init are paid once instead of once per clip.
+    """
+    n = len(clips)
+    longest = max(c.dur for c in clips)
+    graph = [f"[0:v]split={n}" + "".join(f"[s{i}]" for i in range(n))]
+    for i, c in enumerate(clips):
+        graph.append(f"[s{i}]trim=end_frame={c.dur},setpts=PTS-STARTPTS,{placeholder_drawtext(c)}[o{i}]")
+    args = [
+        "ffmpeg", "-y", "-f", "lavfi",
+        "-i", f"color=c=0x111111:s={target.size}:d={float(longest / target.fps)}:r={target.fps}",
+        "-filter_complex", ";".join(graph),
+    ]
+    for i, outfile in enumerate(outfiles):
+        args += ["-map", f"[o{i}]"] + PLACEHOLDER_ENCODE + [outfile]
+    return args
+
+
+def still_key(clip, target=DEFAULT_TARGET):
+    """Content address for a still placeholder (duration and frame rate do not affect its pixels)."""
+    return placeholder_key(["still", placeholder_label(clip), target.size, "#111111"])
+
+
+def placeholder_source(clip, cache, out_dir=None, target=DEFAULT_TARGET):
+    """The encoded placeholder of `clip`: out_dir's placeholders/ copy when it is there, else its cache entry.
+
+    The package's own copy outlives cache eviction; the cache entry is what
+    an archive build has just delivered.
+    """
+    if out_dir is not None:
+        path = os.path.join(out_dir, "placeholders", f"{clip.id}.mp4")
+        if os.path.exists(path):
+            return path
+    return cache.path(placeholder_key(placeholder_args(clip, target)))
+
+
+def link_or_copy(src, dst):
+    """Hard-link src to dst, falling back to a copy across filesystems."""
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class PlaceholderCache:
+    """Content-addressed store of encoded placeholders with an LRU size cap.
+
+    Entries are `<key>.mp4` files; a hit bumps the file's mtime, and eviction
+    drops the least recently used entries until the cache fits in max_bytes.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, f"{key}.mp4")
+
+    def lookup(self, key):
+        path = self.path(key)
+        if os.path.exists(path):
+            os.utime(path)
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def partial(self, key):
+        """Where an encode writes before publish(), so a killed run never leaves a torn entry."""
+        return os.path.join(self.root, f"{key}.{os.getpid()}.partial.mp4")
+
+    def publish(self, keys):
+        for key in keys:
+            os.replace(self.partial(key), self.path(key))
+
+    def size(self):
+        return sum(e.stat().st_size for e in os.scandir(self.root) if e.name.endswith(".mp4"))
+
+    def evict(self, keep=()):
+        """Drop least recently used entries (never ones in `keep`) until under the cap."""
+        keep = {self.path(k) for k in keep}
+        entries = sorted(
+            (e for e in os.scandir(self.root) if e.name.endswith(".mp4") and ".partial." not in e.name),
+            key=lambda e: e.stat().st_mtime,
+        )
+        total = sum(e.stat().st_size for e in entries)
+        for e in entries:
+            if total <= self.max_bytes:
+                break
+            if e.path in keep:
+                continue
+            total -= e.stat().st_size
+            os.remove(e.path)
+            self.evicted += 1
+
+    def stats(self):
+        return (f"{self.hits} hit, {self.misses} miss, {self.evicted} evicted "
+                f"({self.size() / 2**20:.1f} MB / {self.max_bytes / 2**20:.0f} MB)")
+
+
+def generate_placeholders(targets, cache, jobs=None, backend="per-clip", profiler=None, timeout=None, retries=1,
+                          deliver=None, out=None):
+    """Generate black placeholder MP4s with section labels.
+
+    `targets` is a list of (out_dir, clip, target) triples and may span
+    several cuts and deliverable targets; each clip comes from its target's
+    timeline. Placeholders come from `cache` when an identical one was
+    encoded before, and identical clips across cuts share a single encode.
+    All misses share one pool: with the per-clip backend they run as up to
+    `jobs` concurrent ffmpegs (default: one per core); the graph backend
+    renders each target's misses from one ffmpeg process.
+    Each encode gets `timeout` seconds and `retries` more tries on transient
+    failures; the first encode that still fails aborts with ffmpeg's stderr.
+    Results are linked into each package's placeholders/ in target order, as
+    soon as they and every clip before them are ready, or handed to
+    `deliver(out_dir, relpath, src, key)` when given.
+    """
+    out_dirs = {out_dir for out_dir, _, _ in targets}
+    if deliver is None:
+        for out_dir in out_dirs:
+            os.makedirs(os.path.join(out_dir, "placeholders"), exist_ok=True)
+
+    keys = [placeholder_key(placeholder_args(c, target)) for _, c, target in targets]
+    # One encode per distinct key; clips with identical pixels share it
+    cached = set()
+    misses = {}
+    for (_, c, target), key in zip(targets, keys):
+        if key in cached or key in misses:
+            continue
+        if cache.lookup(key):
+            cached.add(key)
+        else:
+            misses[key] = (c, target)
+
+    if backend == "graph" and misses:
+        # One graph per raster and rate, since they share a single color source
+        groups = {}
+        for key, (c, target) in misses.items():
+            groups.setdefault(target, {})[key] = c
+        batch, batch_keys = [], []
+        for target, group in groups.items():
+            outputs = [cache.partial(k) for k in group]
+            name = f"graph ({len(group)} clips)" if len(groups) == 1 else f"graph {target} ({len(group)} clips)"
+            batch.append(Job(name, placeholder_graph_args(list(group.values()), outputs, target),
+                             outputs, max(c.dur for c in group.values())))
+            batch_keys.append(list(group))
+    else:
+        batch = [Job(f"{c.id}.mp4" if target == DEFAULT_TARGET else f"{c.id}.mp4 ({target})",
+                     placeholder_args(c, target) + [cache.partial(key)], [cache.partial(key)], c.dur)
+                 for key, (c, target) in misses.items()]
+        batch_keys = [[key] for key in misses]
+
+    ready = set(cached)
+    placed = 0
+
+    def place():
+        """Link and report clips in target order, up to the first one still encoding."""
+        nonlocal placed
+        while placed < len(targets) and keys[placed] in ready:
+            (out_dir, c, _), key = targets[placed], keys[placed]
+            if deliver is None:
+                link_or_copy(cache.path(key), os.path.join(out_dir, "placeholders", f"{c.id}.mp4"))
+            else:
+                deliver(out_dir, f"placeholders/{c.id}.mp4", cache.path(key), key)
+            name = f"{c.id}.mp4" if len(out_dirs) == 1 else f"{os.path.basename(out_dir)}/{c.id}.mp4"
+            print(f"  ✓ {name} ({float(c.section['dur']):g}s, {c.dur}f){' (cached)' if key in cached else ''}",
+                  file=out)
+            placed += 1
+
+    job_keys = dict(zip(batch, batch_keys))
+
+    def done(job):
+        if profiler is not None:
+            size = sum(os.path.getsize(p) for p in job.outputs) if job.ok else None
+            profiler.job("placeholders", job.name, job.wall_s, job.returncode, job.stderr, size, attempts=job.attempts)
+        # Finished encodes are kept even when another one fails
+        if job.ok:
+            cache.publish(job_keys[job])
+            ready.update(job_keys[job])
+            place()
+
+    place()
+    run_jobs(batch, concurrency=jobs, timeout=timeout, retries=retries, on_done=done)
+    failed = next((job for job in batch if job.returncode not in (0, None)), None)
+    if failed:
+        raise RuntimeError(failed.error())
+
+    cache.evict(keep=keys)
+
+
+def write_still(path, label, profiler=None, target=DEFAULT_TARGET):
+    start = time.perf_counter()
+    write_card(path, target.width, target.height, label)
+    if profiler is not None:
+        profiler.job("placeholders", os.path.basename(path), time.perf_counter() - start,
+                     bytes_written=os.path.getsize(path))
+
+
+def generate_stills(targets, jobs=None, profiler=None, deliver=None, out=None):
+    """Write one PNG card per (out_dir, clip, target), at the target's size, in-process.
+
+    Identical cards (same label) are drawn once and linked to the rest.
+    zlib releases the GIL, so the pool still spreads compression over cores.
+    With `deliver`, cards are drawn in a scratch directory and handed to
+    deliver(out_dir, relpath, src, key) instead of being placed in out_dir.
+    """
+    if deliver is None:
+        for out_dir in {out_dir for out_dir, _, _ in targets}:
+            os.makedirs(os.path.join(out_dir, "placeholders"), exist_ok=True)
+
+    first = {}
+    scratch = tempfile.TemporaryDirectory() if deliver else contextlib.nullcontext()
+    with scratch as scratch_dir, ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        renders = []
+        for out_dir, c, target in targets:
+            key = still_key(c, target)
+            if key in first:
+                renders.append((key, first[key], None))
+            else:
+                path = os.path.join(scratch_dir or out_dir, f"{key}.png" if deliver else f"placeholders/{c.id}.png")
+                first[key] = path
+                renders.append((key, path, pool.submit(write_still, path, placeholder_label(c), profiler, target)))
+        for (out_dir, c, _), (key, src, fut) in zip(targets, renders):
+            if fut is not None:
+                fut.result()
+            if deliver is not None:
+                deliver(out_dir, f"placeholders/{c.id}.png", src, key)
+            elif fut is None:
+                link_or_copy(src, os.path.join(out_dir, "placeholders", f"{c.id}.png"))
+            print(f"  ✓ {c.id}.png ({float(c.section['dur']):g}s, {c.dur}f)", file=out)
+
+
+ANIMATIC = "ai-selves-leti-animatic.mp4"
+
+
+def concat_quote(path):
+    """Quote a path for a concat demuxer list."""
+    return "'" + os.path.abspath(path).replace("'", "'\\''") + "'"
+
+
+def filter_quote(path):
+    """Escape a path as a filter option value inside a filtergraph."""
+    path = os.path.abspath(path)
+    for ch in "\\':":
+        path = path.replace(ch, "\\" + ch)
+    for ch in "\\'[],;":
+        path = path.replace(ch, "\\" + ch)
+    return path
+
+
+def animatic_inputs(timeline, ext="mp4", target=DEFAULT_TARGET):
+    return digest("animatic", ext, timeline.fps,
+                  [still_key(c, target) if ext == "png" else placeholder_key(placeholder_args(c, target))
+                   for c in timeline.clips],
+                  ((c.index, c.start, c.end, c.text) for c in timeline.cues))
+
+
+def run_ffmpeg(job, timeout=None, retries=1):
+    run_jobs([job], concurrency=1, timeout=timeout, retries=retries)
+    if not job.ok:
+        raise RuntimeError(job.error())
+
+
+def generate_animatic(out_dir, timeline, cache, ext="mp4", timeout=None, retries=1, deliver=None,
+                      target=DEFAULT_TARGET, out=None):
+    """Render ai-selves-leti-animatic.mp4: the whole cut with subtitles burned in.
+
+    MP4 placeholders are joined by the concat demuxer with stream copy (no
+    re-encode); the joined cut is cached under the placeholder keys, so a
+    subtitle-only edit reuses it. A final pass burns in the subtitles.
+    Still cards have no video stream to copy, so they are timed with concat
+    `duration` directives and encoded in that same final pass.
+    """
+    dst = os.path.join(out_dir, ANIMATIC)
+    with tempfile.TemporaryDirectory() as scratch:
+        srt = os.path.join(scratch, "subs.srt")
+        with open(srt, "w", encoding="utf-8") as f:
+            export(timeline, [SrtSink(f)])
+        if deliver is not None:
+            dst = os.path.join(scratch, ANIMATIC)
+
+        listing = os.path.join(scratch, "concat.txt")
+        with open(listing, "w", encoding="utf-8") as f:
+            f.write("ffconcat version 1.0\n")
+            if ext == "png":
+                # Cards are redrawn when the package went to an archive
+                for c in timeline.clips:
+                    src = os.path.join(out_dir, "placeholders", f"{c.id}.png")
+                    if deliver is not None:
+                        src = os.path.join(scratch, f"{still_key(c, target)}.png")
+                        if not os.path.exists(src):
+                            write_card(src, target.width, target.height, placeholder_label(c))
+                    f.write(f"file {concat_quote(src)}\nduration {float(c.dur / timeline.fps):.6f}\n")
+                if timeline.clips:
+                    f.write(f"file {concat_quote(src)}\n")  # the last duration only applies to a following entry
+            else:
+                # The package's own placeholders, which stay put when cache entries are evicted
+                for c in timeline.clips:
+                    src = placeholder_source(c, cache, None if deliver is not None else out_dir, target)
+                    f.write(f"file {concat_quote(src)}\n")
+
+        subs = f"subtitles={filter_quote(srt)}"
+        if ext == "png":
+            vf = f"fps={timeline.fps},format=yuv420p" + (f",{subs}" if timeline.cues else "")
+            run_ffmpeg(Job(ANIMATIC, ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", listing, "-vf", vf,
+                                      "-frames:v", str(timeline.frames)] + PLACEHOLDER_ENCODE + [dst],
+                           [dst], timeline.frames), timeout, retries)
+        else:
+            key = placeholder_key(["animatic"] + [placeholder_key(placeholder_args(c, target)) for c in timeline.clips])
+            joined = cache.lookup(key)
+            if joined is None:
+                run_ffmpeg(Job(f"{ANIMATIC} (concat)", ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", listing,
+                                                        "-c", "copy", cache.partial(key)],
+                               [cache.partial(key)], timeline.frames), timeout, retries)
+                cache.publish([key])
+                joined = cache.path(key)
+            if timeline.cues:
+                run_ffmpeg(Job(ANIMATIC, ["ffmpeg", "-y", "-i", joined, "-vf", subs] + PLACEHOLDER_ENCODE + [dst],
+                               [dst], timeline.frames), timeout, retries)
+            else:
+                link_or_copy(joined, dst)
+
+        size = os.path.getsize(dst)
+        if deliver is not None:
+            deliver(out_dir, ANIMATIC, dst, None)
+    print(f"  ✓ {ANIMATIC} ({timeline.seconds:g}s, {len(timeline.cues)} subtitles burned in)", file=out)
+    return size
+
+
+def storyboard_frames(timeline, cache, out_dir=None, ext="mp4", target=DEFAULT_TARGET, media=None):
+    """Each clip's storyboard Frame: the middle of its conformed media or of its placeholder.
+
+    MP4 placeholders come from placeholder_source(); still cards are redrawn.
+    """
+    media = media or {}
+    frames = []
+    for c in timeline.clips:
+        mid = float(c.dur / timeline.fps) / 2
+        m = media.get(c.id)
+        if m is not None:
+            seek = (min(mid, m.duration / 2) if m.duration else mid) if m.is_video else None
+            frames.append(Frame(digest("media", m.path, m.mtime_ns, m.size), m.path, seek, None))
+        elif ext == "png":
+            frames.append(Frame(still_key(c, target), None, None, placeholder_label(c)))
+        else:
+            key = placeholder_key(placeholder_args(c, target))
+            frames.append(Frame(key, placeholder_source(c, cache, out_dir, target), mid, None))
+    return frames
+
+
+def open_sink(fmt, fh, ext="mp4", target=DEFAULT_TARGET, media=None, acts=False, names=UNTITLED):
+    """The export sink for one --formats entry, configured for this package.
+
+    `acts` nests the XML's acts as sequences of their own (see XmemlActsSink).
+    `names` is the cut's (project, sequence); the EDL and OTIO are titled after the project.
+    """
+    project, sequence = names
+    if fmt == "xml":
+        sink = XmemlActsSink if acts else XmemlSink
+        return sink(fh, target.fps, project, sequence, media_ext=ext,
+                    width=target.width, height=target.height, media=media)
+    if fmt == "edl":
+        return EdlSink(fh, project, media_ext=ext)
+    if fmt == "otio":
+        return OtioSink(fh, project, media_ext=ext)
+    return SINKS[fmt](fh)
+
+
+def stream_export(fmt, fh, timeline, ext="mp4", target=DEFAULT_TARGET, media=None, names=UNTITLED):
+    """Stream one export format into the text file object `fh`. Returns the sink, for summary()."""
+    sink = open_sink(fmt, fh, ext, target, media, names=names)
+    export(timeline, [sink])
+    return sink
+
+
+def render_export(fmt, timeline, ext="mp4", target=DEFAULT_TARGET, media=None, names=UNTITLED):
+    """One export format as a string, for callers that want the document in memory."""
+    buf = io.StringIO()
+    stream_export(fmt, buf, timeline, ext, target, media, names)
+    return buf.getvalue()
+
+
+def write_exports(out_dir, timeline, formats, ext="mp4", opener=None, target=DEFAULT_TARGET, media=None,
+                  acts=False, act_files=(), out=None, names=UNTITLED):
+    """Write ai-selves-leti.<fmt> for every format from one pass over the timeline.
+
+    `ext` picks the placeholder kind the XML/EDL/OTIO reference: mp4 clips,
+    or png stills which, like the hand-built v6 package, carry no media
+    duration of their own. `opener(filename)` can supply the file handles
+    (e.g. archive members). `timeline` must be at `target.fps`. `media`
+    ({clip id: Media}) points the XML at conformed footage instead, and
+    `names` is the cut's (project, sequence). `acts` nests the XML by act; the acts whose ids are in `act_files` are
+    also written standalone to acts/<id>.xml in the same pass.
+    Returns {fmt: (bytes written, seconds in write calls)}, with "acts" for acts/.
+    """
+    files, sinks, act_out = [], [], []
+
+    def open_act(aid):
+        if aid not in act_files:
+            return None
+        name = f"acts/{aid}.xml"
+        if opener:
+            f = opener(name)
+        else:
+            os.makedirs(os.path.join(out_dir, "acts"), exist_ok=True)
+            f = open(os.path.join(out_dir, name), "w", encoding="utf-8")
+        act_out.append(MeteredFile(f))
+        return act_out[-1]
+
+    try:
+        for fmt in formats:
+            name = f"ai-selves-leti.{fmt}"
+            f = opener(name) if opener else open(os.path.join(out_dir, name), "w", encoding="utf-8")
+            files.append(MeteredFile(f))
+            sinks.append(open_sink(fmt, files[-1], ext, target, media, acts, names))
+        split = None
+        if act_files:
+            split = XmemlActsSink(None, target.fps, *names, media_ext=ext, width=target.width, height=target.height,
+                                  media=media, split=open_act)
+            sinks.append(split)
+        export(timeline, sinks)
+    finally:
+        for f in files:
+            f.close()
+    for fmt, sink in zip(formats, sinks):
+        print(f"  ✓ ai-selves-leti.{fmt} ({sink.summary()})", file=out)
+    written = {fmt: (f.bytes, round(f.io_seconds, 6)) for fmt, f in zip(formats, files)}
+    if split is not None:
+        print(f"  ✓ acts/ ({split.summary()})", file=out)
+        written["acts"] = (sum(f.bytes for f in act_out), round(sum(f.io_seconds for f in act_out), 6))
+    return written
+
+
+def generate_srt(out_dir, timeline):
+    """Generate the SRT alone. Returns (bytes written, seconds spent in write calls)."""
+    return write_exports(out_dir, timeline, ["srt"])["srt"]
+
+
+def generate_xml(out_dir, timeline, ext="mp4", media=None):
+    """Generate the FCP XML alone. Returns (bytes written, seconds spent in write calls)."""
+    return write_exports(out_dir, timeline, ["xml"], ext, media=media)["xml"]
+
+
+def export_inputs(fmt, timeline, ext="mp4", target=DEFAULT_TARGET, media=None, acts=False, names=UNTITLED):
+    """Hash of what one export format is built from: subtitle-only formats ignore clips, the EDL ignores cues."""
+    clips = ((c.index, c.id, c.label, c.start, c.end) for c in timeline.clips)
+    cues = ((c.index, c.start, c.end, c.text) for c in timeline.cues)
+    if fmt in ("srt", "vtt"):
+        return digest(fmt, timeline.fps, cues)
+    if fmt == "edl":
+        return digest(fmt, timeline.fps, ext, clips, names[0])
+    if fmt == "otio":
+        return digest(fmt, *target, ext, clips, cues, sorted((media or {}).items()), names[0])
+    if acts:
+        return digest(fmt, *target, ext, clips, cues, sorted((media or {}).items()), [a.name for a in timeline.acts],
+                      names)
+    return digest(fmt, *target, ext, clips, cues, sorted((media or {}).items()), names)
+
+
+def target_dir(out_dir, target):
+    """Package folder of a cut at a target: the cut's own folder at 1920x1080@24, suffixed otherwise."""
+    return out_dir if target == DEFAULT_TARGET else f"{out_dir}-{target.slug}"
+
+
+class Package:
+    """One cut at one target: what build_packages() built and where."""
+    __slots__ = ("name", "timeline", "out_dir", "graph", "target", "media", "names", "docs")
+
+    def __init__(self, name, timeline, out_dir, graph, target=DEFAULT_TARGET, media=None, names=UNTITLED, docs=None):
+        self.name = name
+        self.timeline = timeline
+        self.out_dir = out_dir
+        self.graph = graph
+        self.target = target
+        self.media = media or {}  # clip id -> conformed Media
+        self.names = names        # (project, sequence) of the XML
+        self.docs = docs          # directed script copied into the package, or None
+
+    def __repr__(self):
+        return f"Package({self.name!r}, {self.out_dir!r})"
+
+
+def archive_deliver(archive):
+    """The `deliver` hook that stores generated files in `archive` under their package's folder; None without one."""
+    if archive is None:
+        return None
+
+    def deliver(out_dir, relpath, src, key):
+        archive.add_file(f"{os.path.basename(out_dir)}/{relpath}", src, key)
+    return deliver
+
+
+def write_package(pkg, profiler, ext="mp4", formats=("srt", "xml"), archive=None, animatic=None, acts=False,
+                  storyboard=None, out=None):
+    """Write the exports and docs of one package; placeholders are already in place.
+
+    With `archive`, everything goes into the archive under out_dir's name
+    instead of into out_dir. `animatic` ({"cache", "timeout", "retries"})
+    also renders the burned-in preview of the whole cut. The cut's docs
+    are copied into the package when they exist. `acts` nests the XML by act and keeps
+    every act in acts/<id>.xml, rewriting only acts whose id is new.
+    `storyboard` ({"cache", "thumbs", "jobs", "timeout", "retries"}) also
+    draws the contact sheets into storyboard/.
+    """
+    name, timeline, out_dir, graph, target = pkg.name, pkg.timeline, pkg.out_dir, pkg.graph, pkg.target
+    docs = pkg.docs
+    prefix = os.path.basename(out_dir)
+    opener = (lambda filename: archive.open(f"{prefix}/{filename}")) if archive else None
+    print(f"\nExporting {', '.join(formats)} ({name})...", file=out)
+    stale = [fmt for fmt in formats
+             if graph.target(f"ai-selves-leti.{fmt}",
+                             export_inputs(fmt, timeline, ext, target, pkg.media, acts, pkg.names))]
+    for fmt in formats:
+        if fmt not in stale:
+            print(f"  · ai-selves-leti.{fmt} up to date", file=out)
+    act_files = set()
+    if acts and "xml" in formats:
+        # An act's id hashes its content, so an unchanged id (in the same project) is an unchanged file
+        ids = [act_id(a, target.fps, target.width, target.height, ext, pkg.media) for a in timeline.acts]
+        act_files = {aid for aid in ids if graph.target(f"acts/{aid}.xml", digest(aid, pkg.names[0]))}
+        if len(act_files) < len(set(ids)):
+            print(f"  · acts/ {len(set(ids)) - len(act_files)} of {len(set(ids))} acts up to date", file=out)
+    if stale or act_files:
+        # Build, serialization and write are one streamed pass for all formats; write_s is the I/O share
+        with profiler.stage(f"export:{name}", formats=stale) as st:
+            written = write_exports(out_dir, timeline, stale, ext, opener, target, pkg.media, acts, act_files, out,
+                                    pkg.names)
+            st["bytes"] = sum(b for b, _ in written.values())
+            st["write_s"] = round(sum(t for _, t in written.values()), 6)
+            st["outputs"] = {fmt: {"bytes": b, "write_s": t} for fmt, (b, t) in written.items()}
+
+    if animatic is not None:
+        print(f"\nRendering animatic ({name})...", file=out)
+        if graph.target(ANIMATIC, animatic_inputs(timeline, ext, target)):
+            with profiler.stage(f"animatic:{name}") as st:
+                st["bytes"] = generate_animatic(out_dir, timeline, ext=ext, deliver=archive_deliver(archive),
+                                                target=target, out=out, **animatic)
+        else:
+            print(f"  · {ANIMATIC} up to date", file=out)
+
+    if storyboard is not None:
+        print(f"\nDrawing storyboard ({name})...", file=out)
+        frames = storyboard_frames(timeline, storyboard["cache"], None if archive else out_dir, ext, target,
+                                   pkg.media)
+        with profiler.stage(f"storyboard:{name}") as st:
+            st["bytes"] = generate_storyboard(out_dir, name, timeline, frames, target, storyboard["thumbs"],
+                                              storyboard["jobs"], storyboard["timeout"], storyboard["retries"],
+                                              graph, archive_deliver(archive), out)
+
+    # Copy directed script
+    if docs and os.path.exists(docs):
+        doc_name = os.path.basename(docs)
+        if graph.target(doc_name, file_digest(docs)):
+            with profiler.stage(f"docs:{name}") as st:
+                if archive:
+                    archive.add_file(f"{prefix}/{doc_name}", docs)
+                else:
+                    shutil.copy2(docs, os.path.join(out_dir, doc_name))
+                st["bytes"] = os.path.getsize(docs)
+            print(f"  ✓ {doc_name}", file=out)
+
+    # Checksummed manifest of everything in the package, written last
+    if archive:
+        digests = {a[len(prefix) + 1:]: d for a, d in archive.digests.items() if a.startswith(prefix + "/")}
+        with contextlib.closing(archive.open(f"{prefix}/{MANIFEST}", always=True)) as f:
+            f.write(manifest_json(prefix, digests))
+    else:
+        graph.finish()
+        with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+            f.write(manifest_json(prefix, dir_digests(out_dir)))
+
+
+def print_package(pkg, out=None):
+    timeline, out_dir, target = pkg.timeline, pkg.out_dir, pkg.target
+    print(f"\n✅ Package ready: {out_dir}/", file=out)
+    print(f"   {len(timeline.clips)} sections | {timeline.seconds:g}s total ({timeline.frames} frames) | "
+          f"{target.size} {rate_label(target.fps)}fps", file=out)
+    print(f"   Build: {pkg.graph.summary()}", file=out)
+    for line in pkg.graph.report():
+        print(f"     {line}", file=out)
+    print(f"\n   Files:", file=out)
+    for f in sorted(os.listdir(out_dir)):
+        if f.startswith("."):
+            continue
+        fp = os.path.join(out_dir, f)
+        if os.path.isdir(fp):
+            count = len(os.listdir(fp))
+            print(f"     {f}/ ({count} {'clips' if f == 'placeholders' else f if f == 'acts' else 'files'})", file=out)
+        else:
+            print(f"     {f}", file=out)
+
+
+def build_packages(cuts, *, formats=("srt", "xml"), targets=(DEFAULT_TARGET,), cache=None,
+                   placeholder_format="mp4", backend="per-clip", jobs=None, timeout=300, retries=1,
+                   animatic=False, archive=None, delta_from=None, base=None, force=False, conform=False,
+                   media_roots=MEDIA_ROOTS, media_index=".cache/media.sqlite", profile=None, acts=False,
+                   storyboard=False, quiet=False, out=None):
+    """Build every cut once per target. Returns the Packages.
+
+    `cuts` are premiere_kit.cuts.Cut, or plain (name, sections, out_dir)
+    tuples, whose XML is then named after the cut and which get no docs.
+
+    The options are gen-premiere-package.py's flags: `archive` streams
+    everything into a .tar.gz/.zip instead, `delta_from` (with `archive`)
+    keeps only files that differ from that release (`base` can pass its
+    digests preloaded), `profile` writes a build report (a path, or "" for
+    build-profile.json next to the packages), `acts` nests the XML by act,
+    `storyboard` draws contact sheets (thumbnails cached in .cache/thumbs). `cache` is a PlaceholderCache
+    (default: .cache/placeholders, capped at 1 GB). Progress is printed to
+    `out` (default sys.stdout), or nowhere with `quiet`.
+
+    Raises ValueError for bad options and RuntimeError when an encode
+    fails; the half-written archive is removed first. Ctrl-C cancels the
+    in-flight encodes and propagates as KeyboardInterrupt.
+    """
+    unknown = [f for f in formats if f not in SINKS]
+    if unknown:
+        raise ValueError(f"unknown format(s) {', '.join(unknown)} (available: {', '.join(SINKS)})")
+    if delta_from and not archive:
+        raise ValueError("delta_from needs an archive for the delta package")
+    if delta_from and base is None:
+        base = load_base(delta_from)
+    cache = cache or PlaceholderCache(CACHE_DIR, CACHE_MAX_MB * 1024 * 1024)
+    return _build(cuts, list(formats), list(targets), cache, placeholder_format, backend, jobs, timeout, retries,
+                  animatic, archive, delta_from, base, force, conform, media_roots, media_index, profile, acts,
+                  storyboard, io.StringIO() if quiet else out)
+
+
+def build_package(sections, out_dir, name=None, **options):
+    """Build one cut into `out_dir` (suffixed per extra target). Returns its Packages, one per target.
+
+    `options` are build_packages()'s.
+    """
+    return build_packages([Cut(name or os.path.basename(out_dir), sections, out_dir)], **options)
+
+
+def _build(cuts, formats, targets, cache, placeholder_format, backend, jobs, timeout, retries, animatic,
+           archive_path, delta_from, base, force, conform, media_roots, media_index, profile, acts, storyboard, out):
+    profiler = Profiler()
+    # Archives are always written whole; placeholders still come from the cache
+    archive = PackageArchive(archive_path, skip=base) if archive_path else None
+    deliver = archive_deliver(archive)
+
+    index = None
+    if conform:
+        with profiler.stage("media-index") as st:
+            index = MediaIndex(media_index)
+            try:
+                index.scan(media_roots, jobs=jobs, timeout=timeout, retries=retries)
+            finally:
+                index.close()
+            st.update(probed=index.probed, cached=index.cached, timed_out=len(index.timed_out))
+        print(f"Indexed media: {index.stats()}", file=out)
+        for path in index.timed_out:
+            print(f"  ⚠ ffprobe timed out on {path}; its sections stay placeholders", file=out)
+
+    # Each cut is compiled once, then retimed for every frame rate in the matrix
+    packages = []
+    with profiler.stage("timeline", targets=[str(t) for t in targets]):
+        for cut in (Cut(*c) for c in cuts):
+            name, out_dir = cut.name, cut.out_dir
+            timeline = Timeline(cut.sections, targets[0].fps)
+            for problem, line in cue_warnings(timeline, timeline.cue_tracks[1]):
+                print(f"  {'⚠' if problem else '·'} {name}: {line}", file=out)
+            media = index.conform(timeline.clips) if index else {}
+            if index:
+                for clip_id, m in media.items():
+                    print(f"  ✓ {name}: {clip_id} → {m.path}", file=out)
+                print(f"  · {name}: {len(media)}/{len(timeline.clips)} sections conformed, "
+                      "the rest stay placeholders", file=out)
+            retimed = {fps: timeline.retime(fps) for fps in dict.fromkeys(t.fps for t in targets)}
+            for target in targets:
+                package = target_dir(out_dir, target)
+                if not archive:
+                    os.makedirs(package, exist_ok=True)
+                packages.append(Package(name if len(targets) == 1 else f"{name} {target}", retimed[target.fps],
+                                        package, BuildGraph(package, force=force or bool(archive)), target, media,
+                                        (cut.project_name, cut.sequence_name), cut.docs))
+    report_path = None
+    if profile is not None:
+        report_path = profile or os.path.join(os.path.dirname(packages[0].out_dir), "build-profile.json")
+
+    # Every cut's and target's stale placeholders go through one shared encode pool
+    print("Generating placeholders...", file=out)
+    still = placeholder_format == "still"
+    ext = "png" if still else "mp4"
+    pending = [(pkg.out_dir, c, pkg.target) for pkg in packages for c in pkg.timeline.clips
+               if pkg.graph.target(f"placeholders/{c.id}.{ext}", still_key(c, pkg.target) if still
+                                   else placeholder_key(placeholder_args(c, pkg.target)))]
+    try:
+        with profiler.stage("placeholders", format=placeholder_format, backend=backend,
+                            jobs=jobs, targets=len(pending)):
+            if still:
+                generate_stills(pending, jobs=jobs, profiler=profiler, deliver=deliver, out=out)
+            else:
+                generate_placeholders(pending, cache, jobs=jobs, backend=backend, profiler=profiler,
+                                      timeout=timeout, retries=retries, deliver=deliver, out=out)
+        up_to_date = sum(len(pkg.graph.skipped) for pkg in packages)
+        if up_to_date:
+            print(f"  · {up_to_date} placeholders up to date", file=out)
+
+        render = {"cache": cache, "timeout": timeout, "retries": retries} if animatic else None
+        sheets = ({"cache": cache, "thumbs": THUMB_DIR, "jobs": jobs, "timeout": timeout, "retries": retries}
+                  if storyboard else None)
+        for pkg in packages:
+            write_package(pkg, profiler, ext, formats, archive, render, acts, sheets, out)
+    except (RuntimeError, KeyboardInterrupt):
+        if archive:
+            archive.abort()
+        if report_path:
+            profiler.write(report_path, failed=True)
+        raise
+
+    if base is not None:
+        names = {os.path.basename(pkg.out_dir) for pkg in packages}
+        removed = sorted(a for a in base if a.split("/", 1)[0] in names and a not in archive.digests
+                         and os.path.basename(a) != MANIFEST)
+        changed = [a for a in archive.stored if os.path.basename(a) != MANIFEST]
+        with contextlib.closing(archive.open(DELTA, always=True)) as f:
+            json.dump({"base": os.path.basename(delta_from or ""), "packages": sorted(names),
+                       "files": changed, "removed": removed}, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if archive:
+        archive.close()
+        print(f"\n✅ {'Delta' if base is not None else 'Archive'} ready: {archive.path}", file=out)
+        print(f"   {archive.members} files ({archive.links} stored as links to identical placeholders) | "
+              f"{os.path.getsize(archive.path) / 2**20:.2f} MB", file=out)
+        if base is not None:
+            print(f"   Δ {len(changed)} changed or new, {archive.members - len(archive.stored)} unchanged, "
+                  f"{len(removed)} removed (against {delta_from})", file=out)
+        for pkg in packages:
+            print(f"     {os.path.basename(pkg.out_dir)}/ — {len(pkg.timeline.clips)} sections | "
+                  f"{pkg.timeline.seconds:g}s total | {pkg.target}", file=out)
+    else:
+        for pkg in packages:
+            print_package(pkg, out)
+    if not still:
+        print(f"\n   Placeholder cache: {cache.stats()}", file=out)
+    if report_path:
+        report = profiler.write(report_path, cuts=[pkg.name for pkg in packages],
+                                cache={"hits": cache.hits, "misses": cache.misses})
+        print(f"   Profile: {report}", file=out)
+    return packages
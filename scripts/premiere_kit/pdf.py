@@ -0,0 +1,57 @@
+"""Minimal PDF writer: one full-page RGB image per page.
+
+Enough PDF for contact sheets without a PDF library: every page is a
+Flate-compressed DeviceRGB image XObject scaled to the page. The file is
+written front to back, one page at a time, with the page tree and catalog
+last and a classic xref table, so only one page is ever in memory and it
+streams into archive members as well as files.
+"""
+
+import zlib
+
+
+def write_pdf(fh, pages, dpi=144):
+    """Write `pages` ((width, height, RGB bytes) each, any iterable) to the binary file object `fh`.
+
+    Pixels map to points at `dpi`, so 144 puts two pixels in every point.
+    Returns the number of pages.
+    """
+    pos = 0
+    offsets = {}
+
+    def write(data):
+        nonlocal pos
+        fh.write(data)
+        pos += len(data)
+
+    def obj(num, body, stream=None):
+        offsets[num] = pos
+        write(f"{num} 0 obj\n".encode() + body)
+        if stream is not None:
+            write(b"\nstream\n" + stream + b"\nendstream")
+        write(b"\nendobj\n")
+
+    write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    # 1: catalog, 2: page tree (both written last), then page, content and image objects for each page
+    count = 0
+    for i, (width, height, rgb) in enumerate(pages):
+        page, content, image = 3 + 3 * i, 4 + 3 * i, 5 + 3 * i
+        w, h = width * 72 / dpi, height * 72 / dpi
+        obj(page, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {w:g} {h:g}] /Contents {content} 0 R "
+                  f"/Resources << /XObject << /Im{i} {image} 0 R >> >> >>".encode())
+        draw = f"q {w:g} 0 0 {h:g} 0 0 cm /Im{i} Do Q".encode()
+        obj(content, f"<< /Length {len(draw)} >>".encode(), draw)
+        data = zlib.compress(rgb, 6)
+        obj(image, f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} /ColorSpace /DeviceRGB "
+                   f"/BitsPerComponent 8 /Filter /FlateDecode /Length {len(data)} >>".encode(), data)
+        count += 1
+    kids = " ".join(f"{3 + 3 * i} 0 R" for i in range(count))
+    obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {count} >>".encode())
+    obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    xref = pos
+    size = max(offsets) + 1
+    write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+    write("".join(f"{offsets[n]:010d} 00000 n \n" for n in range(1, size)).encode())
+    write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return count
@@ -0,0 +1,147 @@
+"""In-process PNG writer and placeholder card renderer.
+
+Writes truecolour PNGs with nothing but zlib, and draws labels with a
+built-in 5x7 bitmap font, so still placeholders need no ffmpeg spawn and
+no font files. Rows are streamed into the compressor one at a time and
+the compressed data goes out in IDAT chunks of about IDAT_SIZE bytes as it
+is produced, so memory stays flat for any image size; all background rows
+are the same bytes object.
+"""
+
+import struct
+import zlib
+
+# 5x7 glyphs, one string of five '#'/'.' columns per row.
+FONT = {
+    "A": ".###.#...##...#######...##...##...#",
+    "B": "####.#...##...#####.#...##...#####.",
+    "C": ".###.#...##....#....#....#...#.###.",
+    "D": "####.#...##...##...##...##...#####.",
+    "E": "######....#....####.#....#....#####",
+    "F": "######....#....####.#....#....#....",
+    "G": ".###.#...##....#.####...##...#.####",
+    "H": "#...##...##...#######...##...##...#",
+    "I": ".###...#....#....#....#....#...###.",
+    "J": "..###...#....#....#....#.#..#..##..",
+    "K": "#...##..#.#.#..##...#.#..#..#.#...#",
+    "L": "#....#....#....#....#....#....#####",
+    "M": "#...###.###.#.##...##...##...##...#",
+    "N": "#...###..##.#.##..###...##...##...#",
+    "O": ".###.#...##...##...##...##...#.###.",
+    "P": "####.#...##...#####.#....#....#....",
+    "Q": ".###.#...##...##...##.#.##..#..##.#",
+    "R": "####.#...##...#####.#.#..#..#.#...#",
+    "S": ".#####....#.....###.....#....#####.",
+    "T": "#####..#....#....#....#....#....#..",
+    "U": "#...##...##...##...##...##...#.###.",
+    "V": "#...##...##...##...##...#.#.#...#..",
+    "W": "#...##...##...##.#.##.#.##.#.#.#.#.",
+    "X": "#...##...#.#.#...#...#.#.#...##...#",
+    "Y": "#...##...#.#.#...#....#....#....#..",
+    "Z": "#####....#...#...#...#...#....#####",
+    "0": ".###.#...##..###.#.###..##...#.###.",
+    "1": "..#...##....#....#....#....#...###.",
+    "2": ".###.#...#....#..##..#...#....#####",
+    "3": ".###.#...#....#..##.....##...#.###.",
+    "4": "...#...##..#.#.#..#.#####...#....#.",
+    "5": "######....####.....#....##...#.###.",
+    "6": "..##..#...#....####.#...##...#.###.",
+    "7": "#####....#...#...#...#....#....#...",
+    "8": ".###.#...##...#.###.#...##...#.###.",
+    "9": ".###.#...##...#.####....#...#..##..",
+    " ": "." * 35,
+    "-": "." * 15 + "#####" + "." * 15,
+    ".": "." * 25 + "..##...##.",
+    ",": "." * 20 + "..##....#...#..",
+    "!": "..#....#....#....#....#.........#..",
+    "?": ".###.#...#....#...#...#.........#..",
+    "'": "..#....#...#...." + "." * 19,
+    ":": "....." + "..##...##." + "....." + "..##...##." + ".....",
+    "/": "....#...#...#...#...#...#....." + ".....",
+    "&": ".##..#..#.#.#...#...#.#.##..#..##.#",
+    "(": "...#...#...#....#....#.....#.....#.",
+    ")": ".#.....#.....#....#....#...#...#...",
+    "+": "....." + "..#.." * 2 + "#####" + "..#.." * 2 + ".....",
+    '"': ".#.#..#.#..#.#." + "." * 20,
+    "[": ".###..#....#....#....#....#....###.",
+    "]": ".###....#....#....#....#....#..###.",
+    "<": "...#...#...#...#.....#.....#.....#.",
+    ">": ".#.....#.....#.....#...#...#...#...",
+}
+# Typographic characters in subtitles and labels, spelled with glyphs the font has
+ASCII = str.maketrans({"—": "-", "–": "-", "…": "...", "“": '"', "”": '"', "‘": "'", "’": "'", "→": "->"})
+BOX = "#####" + "#...#" * 5 + "#####"
+IDAT_SIZE = 64 * 1024
+GLYPH_W, GLYPH_H = 5, 7
+
+
+def hex_rgb(color):
+    color = color.lstrip("#").removeprefix("0x")
+    return bytes(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _chunk(tag, data):
+    body = tag + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+
+def write_png(fh, width, height, rows):
+    """Write an 8-bit RGB PNG; `rows` yields `height` rows of width*3 bytes."""
+    fh.write(b"\x89PNG\r\n\x1a\n")
+    fh.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+    comp = zlib.compressobj(6)
+    data, size = [], 0
+    for row in rows:
+        data.append(comp.compress(b"\x00" + row))
+        size += len(data[-1])
+        if size >= IDAT_SIZE:
+            fh.write(_chunk(b"IDAT", b"".join(data)))
+            data, size = [], 0
+    data.append(comp.flush())
+    fh.write(_chunk(b"IDAT", b"".join(data)))
+    fh.write(_chunk(b"IEND", b""))
+
+
+def transliterate(text):
+    """`text` with dashes, ellipses, curly quotes and arrows spelled in ASCII the font can draw."""
+    return text.translate(ASCII)
+
+
+def text_rows(text, scale, fg, bg):
+    """Rasterise `text` with the bitmap font: GLYPH_H * scale rows of RGB bytes."""
+    glyphs = [FONT.get(ch, BOX) for ch in transliterate(text).upper()]
+    rows = []
+    for gy in range(GLYPH_H):
+        px = bytearray()
+        for i, glyph in enumerate(glyphs):
+            if i:
+                px += bg * scale  # one-column gap between glyphs
+            for gx in range(GLYPH_W):
+                px += (fg if glyph[gy * GLYPH_W + gx] == "#" else bg) * scale
+        rows.extend([bytes(px)] * scale)
+    return rows
+
+
+def card_rows(width, height, label, bg="#111111", fg="#FFFFFF", text_height=48):
+    """Rows of a solid card with `label` centred, like the ffmpeg placeholders."""
+    bg_px, fg_px = hex_rgb(bg), hex_rgb(fg)
+    blank = bg_px * width
+    scale = max(1, round(text_height / GLYPH_H))
+    text = text_rows(label, scale, fg_px, bg_px)
+    text_w = len(text[0]) // 3 if label else 0
+    if text_w > width:
+        text = [r[:width * 3] for r in text]
+        text_w = width
+    left = bg_px * ((width - text_w) // 2)
+    right = bg_px * (width - text_w - (width - text_w) // 2)
+    top = (height - len(text)) // 2
+    for y in range(height):
+        if label and top <= y < top + len(text):
+            yield left + text[y - top] + right
+        else:
+            yield blank
+
+
+def write_card(path, width, height, label, **style):
+    with open(path, "wb") as f:
+        write_png(f, width, height, card_rows(width, height, label, **style))
@@ -0,0 +1,113 @@
+"""Per-stage build profiling and the machine-readable build report.
+
+A `Profiler` is cheap enough to run on every build; the report is only
+written when a script is asked for it (`--profile`). Each stage records
+wall time, our own CPU time, and CPU time of child processes (ffmpeg)
+that finished during the stage. Jobs (one placeholder encode, one still)
+record their wall time, exit code, the tail of stderr and bytes written.
+"""
+
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Reports keep the same stderr tail the runner collects for each job
+from premiere_kit.ffmpeg import STDERR_TAIL
+
+
+def _cpu_children():
+    ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return ru.ru_utime + ru.ru_stime
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process and of its largest child, in KiB."""
+    scale = 1024 if sys.platform == "darwin" else 1  # macOS reports bytes
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale,
+    }
+
+
+class MeteredFile:
+    """File wrapper counting bytes written and time spent inside write()."""
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.bytes = 0
+        self.io_seconds = 0.0
+
+    def write(self, data):
+        start = time.perf_counter()
+        self.fh.write(data)
+        self.io_seconds += time.perf_counter() - start
+        self.bytes += len(data.encode() if isinstance(data, str) else data)
+
+    def __getattr__(self, name):
+        return getattr(self.fh, name)
+
+
+class Profiler:
+    def __init__(self):
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.stages = []
+        self.jobs = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, **meta):
+        """Time a block. Yields a dict the block can add fields to (e.g. bytes)."""
+        record = {"stage": name, **meta}
+        wall, cpu, child = time.perf_counter(), time.process_time(), _cpu_children()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall, 6)
+            record["cpu_s"] = round(time.process_time() - cpu, 6)
+            record["child_cpu_s"] = round(_cpu_children() - child, 6)
+            with self._lock:
+                self.stages.append(record)
+
+    def job(self, stage, name, wall_s, returncode=None, stderr=None, bytes_written=None, **extra):
+        record = {"stage": stage, "name": name, "wall_s": round(wall_s, 6), **extra}
+        if returncode is not None:
+            record["returncode"] = returncode
+        if stderr:
+            record["stderr_tail"] = stderr.strip().splitlines()[-STDERR_TAIL:]
+        if bytes_written is not None:
+            record["bytes"] = bytes_written
+        with self._lock:
+            self.jobs.append(record)
+
+    def report(self, **extra):
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started)),
+            "argv": sys.argv,
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "cpus": os.cpu_count(),
+            "wall_s": round(time.perf_counter() - self.t0, 6),
+            "peak_rss_kb": peak_rss_kb(),
+            **extra,
+            "stages": self.stages,
+            "jobs": self.jobs,
+        }
+
+    def write(self, path, **extra):
+        """Write the JSON report and append a one-line summary to <path>.history.jsonl."""
+        report = self.report(**extra)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        summary = {k: report[k] for k in ("started_at", "argv", "wall_s", "peak_rss_kb")}
+        summary["stages"] = {s["stage"]: s["wall_s"] for s in self.stages}
+        with open(os.path.splitext(path)[0] + ".history.jsonl", "a") as f:
+            f.write(json.dumps(summary) + "\n")
+        return path
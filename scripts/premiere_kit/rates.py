@@ -0,0 +1,67 @@
+"""Exact frame-rate arithmetic for 24, 25, 30 and the NTSC rates.
+
+A rate is an int for whole rates (so timebases, digests and documents
+built on them stay exactly as they were) and a `Fraction` otherwise:
+29.97 is 30000/1001, 23.976 is 24000/1001, 59.94 is 60000/1001. Nothing
+here goes through floats.
+
+Rounding policy: a boundary at source frame f lies at exactly f / src
+seconds, which is f * dst / src frames at the destination rate. It is
+rounded to the nearest destination frame, an exact half rounding up (to
+the later frame). Only boundaries are rounded, never durations, so
+consecutive scenes stay contiguous, every boundary is within half a frame
+of its source instant, and no error accumulates along a long cut. The
+price is that a scene shorter than one destination frame can round to
+zero frames.
+"""
+
+from fractions import Fraction
+
+
+def parse_rate(value):
+    """A frame rate from 24, "25", 29.97, "23.976" or "30000/1001". Raises ValueError.
+
+    Decimal rates within 0.005 of an NTSC rate (n * 1000/1001) are that rate;
+    anything else that is not a whole number (24.5, 50/3) is rejected, as
+    xmeml and timecode can only count whole and NTSC rates.
+    """
+    try:
+        rate = Fraction(value) if not isinstance(value, str) else Fraction(value.strip())
+    except (TypeError, ValueError, ZeroDivisionError):
+        raise ValueError(f"bad frame rate {value!r} (expected e.g. 24, 25, 29.97 or 30000/1001)") from None
+    if rate <= 0:
+        raise ValueError(f"bad frame rate {value!r}: must be positive")
+    if rate.denominator != 1 and rate.denominator != 1001:
+        ntsc = Fraction(round(rate) * 1000, 1001)
+        if abs(rate - ntsc) < Fraction(5, 1000):
+            rate = ntsc
+    if rate.denominator != 1 and (rate.denominator != 1001 or rate.numerator % 1000):
+        raise ValueError(f"bad frame rate {value!r}: must be whole or NTSC (e.g. 23.976, 29.97)")
+    return int(rate) if rate.denominator == 1 else rate
+
+
+def timebase(rate):
+    """(integer timebase, ntsc flag) as xmeml and timecode count it: 29.97 is (30, True)."""
+    rate = Fraction(rate)
+    return round(rate), rate.denominator == 1001
+
+
+def rate_label(rate):
+    """Short display form: 24, 29.97, 23.976."""
+    if Fraction(rate).denominator == 1:
+        return str(int(rate))
+    return f"{float(rate):.3f}".rstrip("0").rstrip(".")
+
+
+def rescale(frames, src, dst):
+    """Boundaries at rate `src` as frames at rate `dst`, in one batch.
+
+    The ratio is reduced once and every boundary costs one integer
+    multiply-add and a floor division, so specs with tens of thousands of
+    scenes convert in milliseconds. Boundaries may themselves be
+    fractional (`Fraction`) source frames.
+    """
+    ratio = Fraction(dst) / Fraction(src)
+    n2, d, d2 = 2 * ratio.numerator, ratio.denominator, 2 * ratio.denominator
+    # f * n / d rounded to nearest, halves up, is floor((2fn + d) / 2d)
+    return [(f * n2 + d) // d2 for f in frames]
@@ -0,0 +1,288 @@
+"""Storyboard contact sheets: one representative frame per section, tiled and captioned.
+
+Every section's frame comes from the middle of its placeholder or
+conformed media. Frames missing from the thumbnail cache are pulled in a
+single ffmpeg run: each source is an input seeked to its frame, trimmed to
+that one frame, scaled into the tile and concatenated into one PPM
+stream. Thumbnails are cached as PPM files keyed by the media's hash and
+the frame's time, so a timing tweak re-extracts only the sections whose
+media changed. Still placeholder cards are drawn straight at tile size,
+like the stills themselves.
+
+Tiles carry the section id, its timecode and length, and its subtitles.
+Pages go to storyboard/page-NN.png and, all together, to
+storyboard/storyboard.pdf; both are written in-process (premiere_kit.png,
+premiere_kit.pdf), one page in memory at a time.
+"""
+
+import os
+import re
+import tempfile
+from collections import namedtuple
+
+from premiere_kit.build import digest
+from premiere_kit.export import timecode
+from premiere_kit.ffmpeg import Job, run_jobs
+from premiere_kit.pdf import write_pdf
+from premiere_kit.png import GLYPH_H, GLYPH_W, card_rows, hex_rgb, text_rows, transliterate, write_png
+from premiere_kit.rates import rate_label, timebase
+
+THUMB_DIR = ".cache/thumbs"
+THUMB_W = 320
+COLUMNS = 4
+PAGE_H = 900  # content height pages aim for; rows are whole tiles
+MARGIN, GUTTER = 24, 16
+SCALE = 2  # caption glyphs are 10x14
+LINE_H = GLYPH_H * SCALE + 6
+CAPTION_LINES = 4  # id, timecode, two lines of subtitles
+HEADER_H = GLYPH_H * 3 + 20
+BATCH = 200  # inputs per ffmpeg run, well under open-file limits
+BG = hex_rgb("#1A1A1A")
+INK, DIM, SUB = hex_rgb("#FFFFFF"), hex_rgb("#9A9A9A"), hex_rgb("#F2D16B")
+PPM = re.compile(rb"P6\s+(\d+)\s+(\d+)\s+255\s")
+
+
+class Frame(namedtuple("Frame", "key path seek label")):
+    """Where a section's representative frame comes from.
+
+    `path` at `seek` seconds (None for a still image), or, when `path` is
+    None, a placeholder card drawn from `label`. `key` is the hash of the
+    media it comes from.
+    """
+    __slots__ = ()
+
+
+def thumb_size(target):
+    """Tile thumbnail size: the target's aspect within THUMB_W x THUMB_W, even sides."""
+    scale = THUMB_W / max(target.width, target.height)
+    return (max(2, round(target.width * scale / 2) * 2), max(2, round(target.height * scale / 2) * 2))
+
+
+def thumb_key(frame, size):
+    return digest("thumb", frame.key, frame.seek, frame.label if frame.path is None else None, *size)
+
+
+def read_ppms(data):
+    """(width, height, RGB bytes) of every image in a stream of binary PPMs."""
+    pos = 0
+    while pos < len(data):
+        m = PPM.match(data, pos)
+        if m is None:
+            raise ValueError(f"not a PPM stream at byte {pos}")
+        width, height = int(m[1]), int(m[2])
+        pos = m.end() + width * height * 3
+        yield width, height, data[m.end():pos]
+
+
+def _thumb_path(thumbs, key):
+    return os.path.join(thumbs, f"{key}.ppm")
+
+
+def extract_args(frames, out, size):
+    """ffmpeg args writing each frame, fitted into `size`, to `out` as one PPM stream, in order."""
+    width, height = size
+    args = ["ffmpeg", "-y"]
+    chains = []
+    for i, frame in enumerate(frames):
+        if frame.seek is not None:
+            args += ["-ss", f"{frame.seek:.6f}"]
+        args += ["-i", frame.path]
+        chains.append(f"[{i}:v:0]trim=end_frame=1,scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                      f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,format=rgb24[t{i}]")
+    concat = "".join(f"[t{i}]" for i in range(len(frames))) + f"concat=n={len(frames)}:v=1:a=0[out]"
+    return args + ["-filter_complex", ";".join(chains + [concat]), "-map", "[out]", "-fps_mode", "passthrough",
+                   "-f", "image2pipe", "-c:v", "ppm", out]
+
+
+def extract_thumbs(frames, size, thumbs=THUMB_DIR, jobs=None, timeout=None, retries=1):
+    """Pull every frame not yet in the `thumbs` cache. Returns (extracted, cached, ffmpeg runs).
+
+    One ffmpeg run covers up to BATCH frames; finished runs are cached even
+    when another one failed, then the failure raises RuntimeError.
+    """
+    os.makedirs(thumbs, exist_ok=True)
+    misses, cached = {}, set()
+    for frame in frames:
+        key = thumb_key(frame, size)
+        if frame.path is None or key in misses or key in cached:
+            continue
+        if os.path.exists(_thumb_path(thumbs, key)):
+            cached.add(key)
+        else:
+            misses[key] = frame
+    if not misses:
+        return 0, len(cached), 0
+    keys = list(misses)
+    batches = [keys[i:i + BATCH] for i in range(0, len(keys), BATCH)]
+    with tempfile.TemporaryDirectory() as scratch:
+        batch = []
+        for n, group in enumerate(batches):
+            out = os.path.join(scratch, f"frames-{n}.ppm")
+            name = "storyboard frames" if len(batches) == 1 else f"storyboard frames {n + 1}/{len(batches)}"
+            batch.append(Job(name, extract_args([misses[k] for k in group], out, size), [out], len(group)))
+        run_jobs(batch, concurrency=jobs, timeout=timeout, retries=retries)
+        for job, group in zip(batch, batches):
+            if not job.ok:
+                continue
+            with open(job.outputs[0], "rb") as f:
+                images = list(read_ppms(f.read()))
+            if len(images) != len(group) or any((w, h) != size for w, h, _ in images):
+                raise RuntimeError(f"ffmpeg returned {len(images)} frames for {len(group)} sections in {job.name}")
+            for key, (w, h, rgb) in zip(group, images):
+                partial = _thumb_path(thumbs, f"{key}.{os.getpid()}.partial")
+                with open(partial, "wb") as f:
+                    f.write(b"P6\n%d %d\n255\n" % (w, h) + rgb)
+                os.replace(partial, _thumb_path(thumbs, key))
+    failed = next((job for job in batch if not job.ok), None)
+    if failed:
+        raise RuntimeError(failed.error())
+    return len(misses), len(cached), len(batch)
+
+
+def thumb_pixels(frame, size, thumbs=THUMB_DIR, card_text=48):
+    """RGB bytes of one tile thumbnail: from the cache, or a card drawn at tile size."""
+    width, height = size
+    if frame.path is None:
+        return b"".join(card_rows(width, height, frame.label, text_height=card_text))
+    with open(_thumb_path(thumbs, thumb_key(frame, size)), "rb") as f:
+        return next(read_ppms(f.read()))[2]
+
+
+def _wrap(text, width, lines):
+    """Word-wrap `text` to at most `lines` lines of `width` characters, ending in ... when cut."""
+    out = []
+    for word in text.split():
+        if out and len(out[-1]) + 1 + len(word) <= width:
+            out[-1] += " " + word
+        else:
+            out.append(word[:width])
+    if len(out) > lines:
+        out = out[:lines]
+        out[-1] = out[-1][:width - 3].rstrip() + "..."
+    return out
+
+
+def captions(timeline):
+    """Caption lines of every clip: id, timecode and length, subtitles."""
+    chars = (THUMB_W + SCALE) // ((GLYPH_W + 1) * SCALE)
+    fps = timeline.fps
+    tb = timebase(fps)[0]
+    subs = {}
+    for cue in timeline.cues:
+        subs.setdefault(cue.clip.index, []).append(transliterate(cue.text))
+    return [[c.id[:chars], f"{timecode(c.start, tb)}  {round(float(c.dur / fps), 2):g}S"[:chars],
+             *_wrap(" / ".join(subs.get(c.index, ())), chars, CAPTION_LINES - 2)]
+            for c in timeline.clips]
+
+
+class Layout:
+    """Page geometry for tiles of one thumbnail size."""
+
+    def __init__(self, size):
+        self.thumb_w, self.thumb_h = size
+        self.tile_h = self.thumb_h + 8 + CAPTION_LINES * LINE_H
+        self.rows = max(1, (PAGE_H + GUTTER) // (self.tile_h + GUTTER))
+        self.per_page = COLUMNS * self.rows
+        self.width = 2 * MARGIN + COLUMNS * THUMB_W + (COLUMNS - 1) * GUTTER
+        self.height = 2 * MARGIN + HEADER_H + self.rows * self.tile_h + (self.rows - 1) * GUTTER
+
+    def tile_origin(self, slot):
+        row, col = divmod(slot, COLUMNS)
+        return MARGIN + col * (THUMB_W + GUTTER), MARGIN + HEADER_H + row * (self.tile_h + GUTTER)
+
+
+def _blit(page, stride, x, y, rows, max_w):
+    for i, row in enumerate(rows):
+        row = row[:max_w * 3]
+        offset = ((y + i) * stride + x) * 3
+        page[offset:offset + len(row)] = row
+
+
+def render_page(layout, header, tiles):
+    """RGB bytes of one page; `tiles` are (thumbnail RGB bytes, caption lines)."""
+    width = layout.width
+    page = bytearray(BG * (width * layout.height))
+    _blit(page, width, MARGIN, MARGIN, text_rows(header, 3, INK, BG), width - 2 * MARGIN)
+    tw, th = layout.thumb_w, layout.thumb_h
+    for slot, (rgb, lines) in enumerate(tiles):
+        x, y = layout.tile_origin(slot)
+        _blit(page, width, x + (THUMB_W - tw) // 2, y, (rgb[r * tw * 3:(r + 1) * tw * 3] for r in range(th)), tw)
+        y += th + 8
+        for n, line in enumerate(lines):
+            color = INK if n == 0 else DIM if n == 1 else SUB
+            _blit(page, width, x, y + n * LINE_H, text_rows(line, SCALE, color, BG), THUMB_W)
+    return bytes(page)
+
+
+def generate_storyboard(out_dir, title, timeline, frames, target, thumbs=THUMB_DIR, jobs=None, timeout=None,
+                        retries=1, graph=None, deliver=None, out=None):
+    """Write storyboard/page-NN.png and storyboard/storyboard.pdf for `timeline`.
+
+    `frames` holds each clip's Frame. With a BuildGraph only stale pages
+    (and the PDF, whenever any page changed) are written; with `deliver`
+    pages are handed to deliver(out_dir, relpath, src, key) instead of
+    being placed in out_dir. Returns the bytes written, or None when the
+    storyboard is up to date. Raises RuntimeError when ffmpeg fails.
+    """
+    size = thumb_size(target)
+    layout = Layout(size)
+    lines = captions(timeline)
+    keys = [thumb_key(f, size) for f in frames]
+    starts = range(0, len(frames), layout.per_page)
+    headers = [f"{title}  -  {target.size} {rate_label(target.fps)}fps  -  page {n + 1}/{len(starts)}"
+               for n in range(len(starts))]
+    page_keys = [digest("storyboard", COLUMNS, layout.rows, size, headers[n], keys[s:s + layout.per_page],
+                        lines[s:s + layout.per_page]) for n, s in enumerate(starts)]
+    stale = {n for n, key in enumerate(page_keys)
+             if graph is None or graph.target(f"storyboard/page-{n + 1:02d}.png", key)}
+    pdf_stale = graph is None or graph.target("storyboard/storyboard.pdf", digest("storyboard.pdf", page_keys))
+    if not stale and not pdf_stale:
+        print("  · storyboard/ up to date", file=out)
+        return None
+
+    needed = range(len(starts)) if pdf_stale else sorted(stale)
+    extracted, cached, runs = extract_thumbs([f for n in needed for f in frames[starts[n]:starts[n] + layout.per_page]],
+                                     size, thumbs, jobs, timeout, retries)
+    card_text = max(GLYPH_H, round(48 * size[0] / target.width))
+    written = 0
+    with tempfile.TemporaryDirectory() as scratch:
+        base = scratch if deliver is not None else os.path.join(out_dir, "storyboard")
+        os.makedirs(base, exist_ok=True)
+
+        def pages():
+            nonlocal written
+            for n in needed:
+                s = starts[n]
+                tiles = [(thumb_pixels(f, size, thumbs, card_text), lines[s + i])
+                         for i, f in enumerate(frames[s:s + layout.per_page])]
+                rgb = render_page(layout, headers[n], tiles)
+                if n in stale:
+                    relpath = f"storyboard/page-{n + 1:02d}.png"
+                    path = os.path.join(base, os.path.basename(relpath))
+                    stride = layout.width * 3
+                    with open(path, "wb") as f:
+                        write_png(f, layout.width, layout.height,
+                                  (rgb[y * stride:(y + 1) * stride] for y in range(layout.height)))
+                    written += os.path.getsize(path)
+                    if deliver is not None:
+                        deliver(out_dir, relpath, path, None)
+                yield layout.width, layout.height, rgb
+
+        if pdf_stale:
+            path = os.path.join(base, "storyboard.pdf")
+            with open(path, "wb") as f:
+                write_pdf(f, pages())
+            written += os.path.getsize(path)
+            if deliver is not None:
+                deliver(out_dir, "storyboard/storyboard.pdf", path, None)
+        else:
+            for _ in pages():
+                pass
+
+    how = [f"{extracted} frame{'s' if extracted != 1 else ''} extracted in {runs} ffmpeg run{'s' if runs != 1 else ''}"
+           ] if runs else []
+    if cached:
+        how.append(f"{cached} cached")
+    print(f"  ✓ storyboard/ ({len(starts)} pages, {len(stale)} written{' + PDF' if pdf_stale else ''}; "
+          f"{', '.join(how) or 'cards drawn in-process'})", file=out)
+    return written
@@ -0,0 +1,53 @@
+"""Deliverable rasters and frame rates.
+
+A target is `WxH@fps`, e.g. 1920x1080@24 for the edit, 1080x1920@30 and
+1080x1080@30 for social cuts. Whole rates are ints, the same integer
+timebase the XML and timeline use; NTSC rates such as 29.97 are exact
+Fractions (see premiere_kit.rates).
+"""
+
+from collections import namedtuple
+
+from premiere_kit.rates import parse_rate, rate_label
+
+
+class Target(namedtuple("Target", "width height fps")):
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, spec, default_fps=24):
+        """`WxH@fps`, or `WxH` at `default_fps`. Raises ValueError."""
+        size, _, fps = spec.strip().partition("@")
+        try:
+            width, height = (int(n) for n in size.lower().split("x"))
+            fps = parse_rate(fps) if fps else default_fps
+        except ValueError:
+            raise ValueError(f"bad target {spec!r} (expected WxH@fps, e.g. 1080x1920@30 or 1920x1080@29.97)") from None
+        if width <= 0 or height <= 0 or fps <= 0:
+            raise ValueError(f"bad target {spec!r}: sizes and rate must be positive")
+        if width % 2 or height % 2:
+            raise ValueError(f"bad target {spec!r}: yuv420p needs an even width and height")
+        return cls(width, height, fps)
+
+    @property
+    def size(self):
+        return f"{self.width}x{self.height}"
+
+    @property
+    def slug(self):
+        """Filesystem-safe name, e.g. 1080x1920-30fps."""
+        return f"{self.size}-{rate_label(self.fps)}fps"
+
+    def __str__(self):
+        return f"{self.size}@{rate_label(self.fps)}"
+
+
+DEFAULT = Target(1920, 1080, 24)
+
+
+def parse_targets(text, default_fps=24):
+    """Comma-separated targets, duplicates dropped, in the order given."""
+    targets = [Target.parse(spec, default_fps) for spec in text.split(",") if spec.strip()]
+    if not targets:
+        raise ValueError("no targets given")
+    return list(dict.fromkeys(targets))
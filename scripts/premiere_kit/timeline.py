@@ -0,0 +1,208 @@
+"""Compiled integer-frame timeline shared by every emitter.
+
+`SECTIONS` lists describe a cut in float seconds. `Timeline` converts them
+to frames exactly once: section offsets are cumulative integer frames, and
+each cue is rounded relative to its section start (the rounding the XML
+emitters always used). SRT, XML and placeholders all read the same frame
+numbers, so they can no longer drift apart on fractional beats like the
+1.3s montage sections.
+
+Sections from an edit spec also carry their source frame span and rate.
+Their clip and cue boundaries are rescaled from those frames in one exact
+batch (premiere_kit.rates), so a 30 fps spec lands on 24, 25 or 29.97
+without a detour through rounded seconds. `fps` is an int or, for NTSC
+rates, a Fraction.
+"""
+
+from array import array
+from fractions import Fraction
+
+from premiere_kit.intervals import allocate_tracks
+from premiere_kit.rates import rescale
+
+
+def sec_to_frames(s, fps):
+    return int(round(s * fps))
+
+
+def _source_frames(seconds, num, den):
+    """Exact `seconds` (int or Fraction) at rate num/den, as an int whenever it is whole."""
+    n, d = seconds.numerator * num, seconds.denominator * den
+    return n // d if n % d == 0 else Fraction(n, d)
+
+
+def _framed(sections, fps):
+    """Clip ends and per-section cue spans of frame-timed sections, as one batch of rescaled boundaries."""
+    rate = sections[0]["rate"]
+    num, den = Fraction(rate).numerator, Fraction(rate).denominator
+    points = []
+    for section in sections:
+        if section.get("rate") != rate:
+            raise ValueError(f"section {section['id']!r} is not timed at {rate} fps like the rest of the cut")
+        start, end = section["frames"]
+        for start_sec, dur_sec, _ in section["subs"]:
+            cue_start = start + _source_frames(start_sec, num, den)
+            points += (cue_start, cue_start + _source_frames(dur_sec, num, den))
+        points.append(end)
+    out = iter(rescale(points, rate, fps))
+    ends, spans = [], []
+    for section in sections:
+        spans.append([(next(out), next(out)) for _ in section["subs"]])
+        ends.append(next(out))
+    return ends, spans
+
+
+def frames_to_srt(frame, fps):
+    """SRT timestamp for a frame number, rounded to the nearest millisecond."""
+    ms = (frame * 1000 * 2 + fps) // (2 * fps)
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+
+class Clip:
+    """One section placed on the timeline, in frames."""
+    __slots__ = ("index", "section", "start", "end")
+
+    def __init__(self, index, section, start, end):
+        self.index = index
+        self.section = section
+        self.start = start
+        self.end = end
+
+    @property
+    def id(self):
+        return self.section["id"]
+
+    @property
+    def label(self):
+        return self.section["label"]
+
+    @property
+    def dur(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"Clip({self.id!r}, {self.start}-{self.end})"
+
+
+class Cue:
+    """One subtitle, in absolute timeline frames."""
+    __slots__ = ("index", "clip", "start", "end", "text")
+
+    def __init__(self, index, clip, start, end, text):
+        self.index = index
+        self.clip = clip
+        self.start = start
+        self.end = end
+        self.text = text
+
+    @property
+    def dur(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"Cue({self.index}, {self.start}-{self.end}, {self.text!r})"
+
+
+class Act:
+    """A run of clips from a section naming an act up to the next one, with their cues."""
+    __slots__ = ("index", "name", "clips", "cues")
+
+    def __init__(self, index, name, clips, cues):
+        self.index = index
+        self.name = name
+        self.clips = clips
+        self.cues = cues
+
+    @property
+    def start(self):
+        return self.clips[0].start
+
+    @property
+    def end(self):
+        return self.clips[-1].end
+
+    @property
+    def dur(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"Act({self.name!r}, {self.start}-{self.end}, {len(self.clips)} clips)"
+
+
+class Timeline:
+    """A cut compiled to frames: clips and cues.
+
+    `offsets[i]` is the first frame of clip i and `offsets[-1]` the total
+    length. Cues keep their definition order (which is SRT numbering).
+    """
+    __slots__ = ("fps", "sections", "clips", "cues", "offsets", "_tracks", "_acts")
+
+    def __init__(self, sections, fps=24):
+        self.fps = fps
+        self.sections = sections
+        self.clips = []
+        self.cues = []
+        self.offsets = array("q", [0])
+        ends, spans = _framed(sections, fps) if sections and "frames" in sections[0] else (None, None)
+        pos = 0
+        for i, section in enumerate(sections):
+            end = ends[i] if ends else pos + sec_to_frames(section["dur"], fps)
+            clip = Clip(i, section, pos, end)
+            self.clips.append(clip)
+            if spans:
+                for (start, cue_end), (_, _, text) in zip(spans[i], section["subs"]):
+                    self.cues.append(Cue(len(self.cues) + 1, clip, start, cue_end, text))
+            else:
+                for start_sec, dur_sec, text in section["subs"]:
+                    start = pos + sec_to_frames(start_sec, fps)
+                    self.cues.append(Cue(len(self.cues) + 1, clip, start, start + sec_to_frames(dur_sec, fps), text))
+            self.offsets.append(end)
+            pos = end
+        self._tracks = None
+        self._acts = None
+
+    @property
+    def frames(self):
+        return self.offsets[-1]
+
+    @property
+    def seconds(self):
+        return float(self.frames / self.fps)
+
+    def retime(self, fps):
+        """The same cut at another frame rate.
+
+        Frames are derived again from the section seconds (or source frames)
+        rather than scaled from this rate's frames, so every rate gets
+        exactly one rounding.
+        """
+        return self if fps == self.fps else Timeline(self.sections, fps)
+
+    @property
+    def cue_tracks(self):
+        """(subtitle track of each cue in cue order, track count); overlapping cues get their own tracks."""
+        if self._tracks is None:
+            self._tracks = allocate_tracks([(c.start, c.end) for c in self.cues])
+        return self._tracks
+
+    @property
+    def acts(self):
+        """The clips grouped into acts, in order.
+
+        A section with an "act" name starts an act that runs until the next
+        one. Sections before the first named act form an act named after
+        their first section.
+        """
+        if self._acts is None:
+            self._acts = []
+            j = 0
+            for clip in self.clips:
+                name = clip.section.get("act")
+                if name or not self._acts:
+                    self._acts.append(Act(len(self._acts), name or clip.id, [], []))
+                act = self._acts[-1]
+                act.clips.append(clip)
+                while j < len(self.cues) and self.cues[j].clip is clip:
+                    act.cues.append(self.cues[j])
+                    j += 1
+        return self._acts
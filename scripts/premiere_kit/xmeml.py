@@ -0,0 +1,55 @@
+"""Streaming writer for FCP `xmeml` documents.
+
+Writes indented XML straight to a file object as elements are opened and
+closed, so memory use does not grow with the timeline. The output matches
+what `minidom.toprettyxml(indent="  ")` produced for the same tree,
+including its escaping and the UTF-8 declaration the generators patch in.
+"""
+
+from contextlib import contextmanager
+
+
+def escape(data):
+    """Escape text and attribute values the way minidom does."""
+    return (str(data).replace("&", "&amp;").replace("<", "&lt;")
+            .replace("\"", "&quot;").replace(">", "&gt;"))
+
+
+class XmemlWriter:
+    def __init__(self, fh, indent="  "):
+        self.fh = fh
+        self.indent = indent
+        self.stack = []
+
+    def _tag(self, tag, attrs):
+        return tag + "".join(f' {k}="{escape(v)}"' for k, v in attrs.items())
+
+    def declaration(self):
+        self.fh.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+
+    def open(self, tag, **attrs):
+        self.fh.write(f"{self.indent * len(self.stack)}<{self._tag(tag, attrs)}>\n")
+        self.stack.append(tag)
+
+    def close(self):
+        tag = self.stack.pop()
+        self.fh.write(f"{self.indent * len(self.stack)}</{tag}>\n")
+
+    @contextmanager
+    def element(self, tag, **attrs):
+        self.open(tag, **attrs)
+        yield self
+        self.close()
+
+    def leaf(self, tag, text="", **attrs):
+        """Write an element with text content only (self-closing when empty)."""
+        pad = self.indent * len(self.stack)
+        if text == "" or text is None:
+            self.fh.write(f"{pad}<{self._tag(tag, attrs)}/>\n")
+        else:
+            self.fh.write(f"{pad}<{self._tag(tag, attrs)}>{escape(text)}</{tag}>\n")
+
+    def rate(self, timebase, ntsc=False):
+        with self.element("rate"):
+            self.leaf("timebase", timebase)
+            self.leaf("ntsc", "TRUE" if ntsc else "FALSE")
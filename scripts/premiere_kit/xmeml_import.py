@@ -0,0 +1,193 @@
+"""Stream an existing xmeml sequence back into the SECTIONS model.
+
+Built on `iterparse`: each clipitem/generatoritem is read when its end tag
+arrives and then dropped from the tree, on every track, as are project
+<clip>s, so memory stays flat no matter how long the editor's export is.
+Only the section list being built grows.
+
+The first video track of the edit's sequence becomes the sections, in
+timeline order; gaps on it become `gap` sections so timing survives. The
+edit is the first project-level sequence that no clip nests, so in an
+--acts export it is the master, whatever order the sequences come in.
+Clips that nest a sequence (`<sequence id=...>` by reference or defined
+inline) are replaced by that sequence's own clips and subtitles, shifted
+to where the clip sits and trimmed to its in/out.
+Every other video track is read as subtitles. Generator items use their
+Text parameter, and clip items (like the v6 `TEXT: "..."` PNG overlays)
+use their name. Each cue is attached to the section it starts in. Audio
+tracks are ignored. A sequence rate with <ntsc>TRUE</ntsc> is exact:
+timebase 30 is 30000/1001.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from bisect import bisect_right
+from fractions import Fraction
+
+ITEMS = ("clipitem", "generatoritem")
+DROP = ITEMS + ("clip",)  # read (or skipped) whole at their end tag, then removed from the tree
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "clip"
+
+
+def _frames(elem, tag):
+    value = elem.findtext(tag)
+    return int(value) if value not in (None, "") and int(value) >= 0 else None
+
+
+def _rate(elem):
+    """Frame rate of a <rate>: its timebase, or timebase * 1000/1001 when <ntsc> is TRUE. None without one."""
+    base = elem.findtext("timebase")
+    if not base:
+        return None
+    ntsc = (elem.findtext("ntsc") or "").strip().upper() == "TRUE"
+    return Fraction(int(base) * 1000, 1001) if ntsc else int(base)
+
+
+def _cue_text(item):
+    for param in item.iter("parameter"):
+        if param.findtext("parameterid") == "str":
+            return param.findtext("value") or ""
+    name = item.findtext("name") or ""
+    name = re.sub(r"^TEXT:\s*", "", name)
+    return name[1:-1] if len(name) > 1 and name[0] == name[-1] == '"' else name
+
+
+def _section_id(marker, item_id, name, index):
+    if marker and re.match(r"^\d+-", marker):
+        return marker
+    return f"{index:02d}-{_slug(marker or item_id or name or '')}"
+
+
+class _Sequence:
+    """What was read from one <sequence>: its picture items, its cues, and where parsing is inside it."""
+
+    def __init__(self, seq_id, level, top):
+        self.id = seq_id
+        self.level = level  # stack depth of the <sequence> element
+        self.top = top      # a project item rather than nested inside a clipitem
+        self.timebase = None  # frame rate: an int, or a Fraction for NTSC
+        self.clips = []     # (start, end, in, marker, item id, name, nested sequence id)
+        self.cues = []      # (start, end, text)
+        self.in_video = False
+        self.track = None
+        self.track_index = -1
+        self.ref = None     # nested sequence of the clipitem being read
+
+
+def _expand(seq, sequences, timebase, shift=0, seen=()):
+    """(clips, cues) of `seq` in `timebase` frames from `shift`, with nested sequences expanded in place."""
+    ratio = Fraction(timebase, seq.timebase)
+    clips, cues = [], []
+    for start, end, in_point, marker, item_id, name, ref in seq.clips:
+        nested = sequences.get(ref)
+        lo, hi = shift + start * ratio, shift + end * ratio
+        if nested is None or ref in seen:
+            clips.append((round(lo), round(hi), marker, item_id, name))
+            continue
+        # The nested sequence plays from its frame `in_point`, trimmed to the clipitem
+        inner_clips, inner_cues = _expand(nested, sequences, timebase, lo - in_point * ratio, seen + (ref,))
+        clips.extend((max(a, round(lo)), min(b, round(hi)), *rest) for a, b, *rest in inner_clips
+                     if b > round(lo) and a < round(hi))
+        cues.extend((max(a, round(lo)), min(b, round(hi)), text) for a, b, text in inner_cues
+                    if b > round(lo) and a < round(hi))
+    cues.extend((round(shift + a * ratio), round(shift + b * ratio), text) for a, b, text in seq.cues)
+    return clips, cues
+
+
+def import_xmeml(source):
+    """Read an xmeml file (path or file object). Returns (sections, frame rate).
+
+    The rate is an int, or a Fraction (e.g. 30000/1001) for NTSC sequences.
+    """
+    stack = []
+    parents = []    # open elements, alongside `stack`
+    open_seqs = []  # sequences being read, innermost last
+    tops = []       # project-level sequences, in document order
+    defined = {}    # sequence id -> _Sequence, for nested sequence references
+    referenced = set()
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(tag)
+            parents.append(elem)
+            if tag == "sequence":
+                open_seqs.append(_Sequence(elem.get("id"), len(stack), "clipitem" not in stack))
+                continue
+            seq = open_seqs[-1] if open_seqs else None
+            if seq is None:
+                continue
+            if tag == "video" and len(stack) == seq.level + 2 and stack[-2] == "media":
+                seq.in_video = True
+            elif seq.in_video and tag == "track" and len(stack) == seq.level + 3:
+                seq.track = elem
+                seq.track_index += 1
+            continue
+
+        stack.pop()
+        parents.pop()
+        seq = open_seqs[-1] if open_seqs else None
+        if seq is None:
+            pass
+        elif tag == "rate" and seq.timebase is None and len(stack) == seq.level:
+            seq.timebase = _rate(elem)
+        elif tag in ITEMS and seq.track is not None and len(stack) == seq.level + 3:
+            start, end = _frames(elem, "start"), _frames(elem, "end")
+            if start is not None and end is not None and end > start:
+                if seq.track_index == 0:
+                    ref = seq.ref if tag == "clipitem" else None
+                    seq.clips.append((start, end, _frames(elem, "in") or 0, elem.findtext("marker/name"),
+                                      elem.get("id"), elem.findtext("name") or "", ref))
+                else:
+                    seq.cues.append((start, end, _cue_text(elem)))
+            seq.ref = None
+        elif tag == "track" and seq.in_video and len(stack) == seq.level + 2:
+            seq.track = None
+        elif tag == "video" and seq.in_video and len(stack) == seq.level + 1:
+            seq.in_video = False
+        elif tag == "sequence" and len(stack) == seq.level - 1:
+            open_seqs.pop()
+            if seq.timebase is not None:
+                if seq.id:
+                    defined.setdefault(seq.id, seq)
+                if seq.top:
+                    tops.append(seq)
+                elem.clear()
+            if open_seqs and stack[-1] == "clipitem" and seq.id:
+                # A nested sequence, by reference or defined inline
+                open_seqs[-1].ref = seq.id
+                referenced.add(seq.id)
+        if tag in DROP and parents:
+            parents[-1].remove(elem)
+            elem.clear()
+
+    if not tops:
+        raise ValueError("no sequence with a rate/timebase found")
+    # The edit is the first sequence no other one nests, e.g. the master of an --acts export
+    main = next((seq for seq in tops if seq.id not in referenced), tops[0])
+    timebase = main.timebase
+    clips, cues = _expand(main, defined, timebase)
+
+    # Picture track -> sections (frame spans), with explicit gaps
+    clips = sorted(((start, end, _section_id(marker, item_id, name, n), name)
+                    for n, (start, end, marker, item_id, name) in enumerate(clips, 1)), key=lambda c: c[0])
+    spans = []
+    pos = 0
+    for start, end, section_id, label in clips:
+        if start > pos:
+            spans.append((pos, start, f"{len(spans) + 1:02d}-gap", "GAP"))
+        spans.append((start, end, section_id, label))
+        pos = max(pos, end)
+
+    sections = [{"id": sid, "label": label, "dur": round(float((end - start) / timebase), 6), "subs": []}
+                for start, end, sid, label in spans]
+    starts = [span[0] for span in spans]
+    for start, end, text in sorted(cues):
+        i = max(bisect_right(starts, start) - 1, 0)
+        offset = start - starts[i]
+        sections[i]["subs"].append((round(float(offset / timebase), 6), round(float((end - start) / timebase), 6),
+                                    text))
+    return sections, timebase
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Render a grid of Remotion variants in parallel and compare them side by side.
+
+Every variant renders from its own copy of the entry's source folder, with
+the `--edit` rewrites applied to that copy, or from the shared tree with
+its parameters passed as input props (`--props`, the default without
+`--edit`). The working tree is never modified. Renders run concurrently
+within a CPU budget, `--frames` or `--still` keep a sweep quick, and the
+results are stacked into one labelled comparison. Run from the project root:
+
+    python3 scripts/render-sweep.py MochiHired --set scale=1,1.2,1.4 --still 120
+    python3 scripts/render-sweep.py MochiHired --frames 0-96 \\
+        --edit src/MochiHired.tsx "width: '[0-9]+%'" "width: '{width}'" \\
+        --variant wide width=300% --variant tight width=350%
+
+Outputs go to out/sweeps/COMPOSITION/: one file per variant (and frame),
+comparison.mp4 or comparison-fN.png, and sweep.json with parameters and
+timings.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from premiere_kit.ffmpeg import Job
+from premiere_kit.package import PLACEHOLDER_ENCODE, run_ffmpeg
+
+NOT_STAGED = {".git", ".cache", "out"}  # never needed by a render, and out/ is where renders land
+OUTPUT_TAIL = 5
+
+def parse_params(pairs):
+    params = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep or not name:
+            raise ValueError(f"bad parameter {pair!r} (expected NAME=VALUE)")
+        params[name] = value
+    return params
+
+def slug(text):
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", text).strip("-") or "variant"
+
+def build_variants(sets, named):
+    """[(name, params)]: every named variant crossed with every point of the --set grid."""
+    axes = []
+    for spec in sets:
+        name, sep, values = spec.partition("=")
+        values = [v for v in values.split(",") if v]
+        if not sep or not name or not values:
+            raise ValueError(f"bad --set {spec!r} (expected NAME=V1,V2,...)")
+        axes.append((name, values))
+    grid = [dict(zip((a for a, _ in axes), point)) for point in itertools.product(*(v for _, v in axes))]
+    bases = [(slug(n), parse_params(p)) for n, *p in named] or [("", {})]
+    variants = []
+    for (base, fixed), point in itertools.product(bases, grid):
+        name = "_".join(filter(None, [base] + [slug(f"{k}-{v}") for k, v in point.items()]))
+        variants.append((name, {**fixed, **point}))
+    names = [n for n, _ in variants]
+    if not names or names == [""]:
+        raise ValueError("nothing to sweep: give --set and/or --variant")
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        raise ValueError(f"variant names collide: {', '.join(dupes)}")
+    return variants
+
+def rewrite(text, pattern, replacement, params):
+    """Replace every match of `pattern` with `replacement`, its {param} fields filled in."""
+    filled = re.sub(r"\{(\w+)\}", lambda m: params.get(m.group(1), m.group(0)), replacement)
+    return re.subn(pattern, lambda m: filled, text)
+
+def stage(workdir, entry, edits, params):
+    """Lay out an isolated project in `workdir`: copies of the folders edits touch, symlinks for the rest.
+
+    Copied folders are real directories so the bundler resolves imports
+    inside the copy, not back in the working tree. Raises ValueError when
+    an edit matches nothing.
+    """
+    copied = {entry.split(os.sep)[0]} | {path.split(os.sep)[0] for path, _, _ in edits}
+    for name in sorted(os.listdir(".")):
+        if name in NOT_STAGED:
+            continue
+        if name in copied:
+            if os.path.isdir(name):
+                shutil.copytree(name, os.path.join(workdir, name), symlinks=True)
+            else:
+                shutil.copy2(name, os.path.join(workdir, name))
+        else:
+            os.symlink(os.path.abspath(name), os.path.join(workdir, name))
+    for path, pattern, replacement in edits:
+        target = os.path.join(workdir, path)
+        with open(target, encoding="utf-8") as f:
+            text, count = rewrite(f.read(), pattern, replacement, params)
+        if not count:
+            raise ValueError(f"--edit pattern {pattern!r} matches nothing in {path}")
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(text)
+
+def render_commands(name, params, args, out_dir, concurrency):
+    """[(output path, argv)] for one variant: a clip, or one still per --still frame.
+
+    Output paths are absolute because staged variants render from their own folder.
+    """
+    out_dir = os.path.abspath(out_dir)
+    extra = [f"--props={json.dumps(params)}"] if args.props else []
+    if args.still:
+        return [(out, ["npx", "remotion", "still", args.entry, args.composition, out, f"--frame={frame}",
+                       "--overwrite"] + extra)
+                for frame in args.still for out in [os.path.join(out_dir, f"{name}-f{frame}.png")]]
+    out = os.path.join(out_dir, f"{name}.mp4")
+    frames = [f"--frames={args.frames}"] if args.frames else []
+    return [(out, ["npx", "remotion", "render", args.entry, args.composition, out, "--overwrite",
+                   f"--concurrency={concurrency}"] + frames + extra)]
+
+def render_variant(name, params, args, out_dir, concurrency):
+    """Stage and render one variant; returns its sweep.json entry."""
+    result = {"name": name, "params": params, "outputs": [], "ok": False}
+    start = time.perf_counter()
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"sweep-{name}-") as workdir:
+            cwd = "."
+            if args.edit:
+                stage(workdir, args.entry, args.edit, params)
+                cwd = workdir
+            for out, argv in render_commands(name, params, args, out_dir, concurrency):
+                proc = subprocess.run(argv, cwd=cwd, stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                                      timeout=args.timeout)
+                if proc.returncode != 0 or not os.path.exists(out):
+                    tail = (proc.stdout + proc.stderr).splitlines()[-OUTPUT_TAIL:]
+                    raise RuntimeError(f"remotion exited {proc.returncode} on {os.path.basename(out)}:\n"
+                                       + "\n".join(tail))
+                result["outputs"].append(os.path.join(out_dir, os.path.basename(out)))
+        result["ok"] = True
+    except subprocess.TimeoutExpired:
+        result["error"] = f"remotion timed out after {args.timeout:g}s"
+    except (OSError, RuntimeError, ValueError) as e:
+        result["error"] = str(e)
+    result["wall_s"] = round(time.perf_counter() - start, 3)
+    return result
+
+def drawtext_quote(text):
+    for ch in "\\':%":
+        text = text.replace(ch, "\\" + ch)
+    return text
+
+def compare_args(inputs, labels, height, out, still=False):
+    """ffmpeg arguments that scale `inputs` to one height, label them and tile them in a grid."""
+    n = len(inputs)
+    cols = math.ceil(math.sqrt(n))
+    graph = [f"[{i}:v]scale=-2:{height},drawtext=text='{drawtext_quote(label)}':fontcolor=white:fontsize=28"
+             f":x=16:y=16:box=1:boxcolor=black@0.6:boxborderw=8:font=monospace[v{i}]"
+             for i, label in enumerate(labels)]
+    if n > 1:
+        cells = []
+        for i in range(n):
+            row, col = divmod(i, cols)
+            cells.append(f"{'+'.join(['w0'] * col) or '0'}_{'+'.join(['h0'] * row) or '0'}")
+        graph.append("".join(f"[v{i}]" for i in range(n))
+                     + f"xstack=inputs={n}:layout={'|'.join(cells)}:fill=black:shortest=1[out]")
+    else:
+        graph[0] = graph[0].replace("[v0]", "[out]")
+    args = ["ffmpeg", "-y"]
+    for path in inputs:
+        args += ["-i", path]
+    args += ["-filter_complex", ";".join(graph), "-map", "[out]"]
+    return args + (["-frames:v", "1"] if still else PLACEHOLDER_ENCODE) + [out]
+
+def compare(results, args, out_dir):
+    """Stack the variants' renders: comparison.mp4, or comparison-fN.png per --still frame."""
+    done = [r for r in results if r["ok"]]
+    groups = ([(f"comparison-f{frame}.png", [r["outputs"][i] for r in done]) for i, frame in enumerate(args.still)]
+              if args.still else [("comparison.mp4", [r["outputs"][0] for r in done])])
+    written = []
+    for filename, inputs in groups:
+        out = os.path.join(out_dir, filename)
+        run_ffmpeg(Job(filename, compare_args(inputs, [r["name"] for r in done], args.compare_height, out,
+                                              still=bool(args.still)), [out]),
+                   timeout=args.timeout)
+        print(f"  ✓ {filename} ({len(inputs)} variants)")
+        written.append(out)
+    return written
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("composition", help="Remotion composition id, e.g. MochiHired")
+    parser.add_argument("--entry", default="src/index.tsx", help="Remotion entry point (default: src/index.tsx)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help="a grid axis; repeat to sweep the cartesian product")
+    parser.add_argument("--variant", action="append", nargs="+", default=[], metavar="NAME [PARAM=VALUE ...]",
+                        help="a named variant with fixed parameters, crossed with the --set grid")
+    parser.add_argument("--edit", action="append", nargs=3, default=[], metavar=("FILE", "REGEX", "REPLACEMENT"),
+                        help="in each variant's copy of the sources, replace REGEX in FILE with REPLACEMENT "
+                             "({name} fields take the variant's parameters)")
+    parser.add_argument("--props", action="store_true",
+                        help="pass the parameters as input props (the default without --edit)")
+    parser.add_argument("--frames", metavar="A-B", help="render only this frame range, e.g. 0-96")
+    parser.add_argument("--still", metavar="N[,N]",
+                        help="render these frames as PNG stills instead of a clip, e.g. 60,120")
+    parser.add_argument("--cpus", type=int, default=os.cpu_count(),
+                        help="CPU budget shared by all renders (default: core count)")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="variants rendered at once (default: as many as the budget allows at 2 cores each)")
+    parser.add_argument("--timeout", type=float, default=1800, help="seconds before a render is abandoned (default: 1800)")
+    parser.add_argument("-o", "--out", help="output folder (default: out/sweeps/COMPOSITION)")
+    parser.add_argument("--compare-height", type=int, default=540,
+                        help="height of each tile in the comparison (default: 540)")
+    parser.add_argument("--no-compare", dest="compare", action="store_false", help="skip the side-by-side comparison")
+    args = parser.parse_args(argv)
+    args.props = args.props or not args.edit
+    args.edit = [(os.path.normpath(path), pattern, replacement) for path, pattern, replacement in args.edit]
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        variants = build_variants(args.set, args.variant)
+        if args.still:
+            args.still = [int(f) for f in args.still.split(",") if f.strip()]
+        if args.frames and not re.fullmatch(r"\d+(-\d*)?", args.frames):
+            raise ValueError(f"bad --frames {args.frames!r} (expected A-B, e.g. 0-96)")
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if args.still and args.frames:
+        raise SystemExit("--still and --frames are alternatives; pick one")
+    if not os.path.exists(args.entry):
+        raise SystemExit(f"no entry point at {args.entry} (run from the project root)")
+    for path, pattern, _ in args.edit:
+        if path.startswith(os.pardir) or os.path.isabs(path) or not os.path.isfile(path):
+            raise SystemExit(f"--edit needs a file inside the project, not {path!r}")
+        with open(path, encoding="utf-8") as f:
+            if not re.search(pattern, f.read()):
+                raise SystemExit(f"--edit pattern {pattern!r} matches nothing in {path}")
+
+    cpus = max(1, args.cpus or 1)
+    jobs = max(1, min(len(variants), args.jobs or cpus // 2 or 1))
+    concurrency = max(1, cpus // jobs)
+    out_dir = args.out or os.path.join("out", "sweeps", args.composition)
+    os.makedirs(out_dir, exist_ok=True)
+    mode = "source copies" if args.edit else "props"
+    print(f"🎛  {len(variants)} variants of {args.composition} ({mode}), {jobs} at a time × {concurrency} threads")
+
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(render_variant, name, params, args, out_dir, concurrency) for name, params in variants]
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            if result["ok"]:
+                print(f"  ✓ {result['name']} ({result['wall_s']:.1f}s)")
+            else:
+                print(f"  ❌ {result['name']}: {result['error']}", file=sys.stderr)
+
+    ok = [r for r in results if r["ok"]]
+    comparison = []
+    if args.compare and ok:
+        try:
+            comparison = compare(results, args, out_dir)
+        except RuntimeError as e:
+            print(f"  ⚠ comparison failed: {e}", file=sys.stderr)
+
+    wall = time.perf_counter() - start
+    report = {
+        "composition": args.composition, "entry": args.entry, "mode": mode, "edits": args.edit,
+        "frames": args.frames, "still": args.still, "cpus": cpus, "jobs": jobs, "concurrency": concurrency,
+        "wall_s": round(wall, 3), "render_s": round(sum(r["wall_s"] for r in results), 3),
+        "variants": results, "comparison": comparison,
+    }
+    with open(os.path.join(out_dir, "sweep.json"), "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n{'✓' if len(ok) == len(results) else '❌'} {len(ok)}/{len(results)} variants in {wall:.1f}s "
+          f"({report['render_s']:.1f}s of rendering) → {out_dir}/")
+    if len(ok) != len(results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
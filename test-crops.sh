@@ -1,25 +1,23 @@
 #!/bin/bash
-# Test different face crop compositions
+# Test different crop compositions of the end-card image, side by side.
+#
+# The sweep rewrites the one percentage-sized <Img> style in
+# src/MochiHired.tsx (the Pika logo on the end card, frames 384-431) to
+# each variant's width and translate(). Each variant renders in parallel
+# from its own copy of src/ (the working tree is left alone); results land
+# in out/sweeps/MochiHired/ with a labelled comparison.mp4. Extra
+# arguments go to render-sweep.py, e.g.
+#   ./test-crops.sh --frames 384-431   just the end card
+#   ./test-crops.sh --still 400        one frame per variant
 
-cd /home/ke/.openclaw-leti-2/workspace/mochi-hired
+cd "$(dirname "$0")"
 
-# Create test versions with different crop values
-declare -A CROPS
-CROPS["v23"]="width: '300%', transform: 'translate(-35%, -25%)'"
-CROPS["v24"]="width: '350%', transform: 'translate(-40%, -28%)'"
-CROPS["v25"]="width: '280%', transform: 'translate(-32%, -22%)'"
-CROPS["v26"]="width: '320%', transform: 'translate(-38%, -26%)'"
-
-for VERSION in v23 v24 v25 v26; do
-    CROP="${CROPS[$VERSION]}"
-    echo "=== Rendering $VERSION with $CROP ==="
-    
-    # Update the crop values in the tsx file
-    sed -i "s|width: '[0-9]*%', height: 'auto', transform: 'translate(-[0-9]*%, -[0-9]*%)'|${CROP}, height: 'auto'|g" src/MochiHired.tsx
-    
-    # Render
-    npx remotion render src/index.tsx MochiHired out/mochi-hired-${VERSION}.mp4 --overwrite 2>&1 | tail -3
-done
-
-echo "=== Done ==="
-ls -la out/mochi-hired-v2*.mp4
+python3 scripts/render-sweep.py MochiHired \
+    --edit src/MochiHired.tsx \
+        "width: '[0-9]+%', height: 'auto'" \
+        "width: '{width}', height: 'auto', transform: 'translate({x}, {y})'" \
+    --variant v23 width=300% x=-35% y=-25% \
+    --variant v24 width=350% x=-40% y=-28% \
+    --variant v25 width=280% x=-32% y=-22% \
+    --variant v26 width=320% x=-38% y=-26% \
+    "$@"